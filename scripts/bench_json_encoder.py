@@ -0,0 +1,130 @@
+"""
+Benchmark for encoding API responses to JSON
+
+Compares the previous two-pass encoding (``safe_serialize`` copy followed by
+``json.dumps``) with the single-pass ``safe_dumps`` encoder on a synthetic
+``get_nodes(include_properties=True)`` payload. Reports wall time and peak
+traced allocations, and asserts that both produce identical JSON.
+
+Runs outside TouchDesigner (no ``td`` import is needed):
+
+    python scripts/bench_json_encoder.py [node_count] [repeat]
+"""
+
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+MODULES_PATH = os.path.join(os.path.dirname(__file__), "..", "td", "modules")
+sys.path.insert(0, os.path.abspath(MODULES_PATH))
+
+from utils.serialization import safe_dumps, safe_serialize  # noqa: E402
+
+
+class Page:
+	"""Stand-in for td.Page"""
+
+	def __init__(self, name: str):
+		self.name = name
+
+
+class Par:
+	"""Stand-in for td.Par: evaluates to its value"""
+
+	def __init__(self, name: str, value, page: Page):
+		self.name = name
+		self.page = page
+		self._value = value
+
+	def eval(self):
+		return self._value
+
+
+class Cell:
+	"""Stand-in for an arbitrary TD object exposing plain attributes"""
+
+	def __init__(self, row: int, col: int, val: str):
+		self.row = row
+		self.col = col
+		self.val = val
+
+
+def build_payload(node_count: int) -> dict:
+	"""Build a Result dict shaped like a large get_nodes response"""
+	pages = [Page(name) for name in ("Common", "Transform", "Render", "Extra")]
+	nodes = []
+	for index in range(node_count):
+		properties = {}
+		for par_index in range(32):
+			properties[f"par{par_index}"] = float(index * par_index) / 7.0
+		properties["file"] = f"movies/clip_{index}.mov"
+		properties["active"] = index % 2 == 0
+		properties["resolution"] = (1920, 1080)
+		properties["opacity"] = Par("opacity", 0.5, pages[index % len(pages)])
+		properties["page"] = pages[index % len(pages)]
+		properties["cell"] = Cell(index, 0, f"value{index}")
+		nodes.append(
+			{
+				"id": index,
+				"name": f"node{index}",
+				"path": f"/project1/container/node{index}",
+				"opType": "moviefileinTOP",
+				"properties": properties,
+			}
+		)
+	return {"success": True, "data": {"nodes": nodes}, "error": None}
+
+
+def two_pass(payload: dict) -> str:
+	return json.dumps(safe_serialize(payload))
+
+
+def measure(encode, payload: dict, repeat: int) -> tuple:
+	"""Return (best seconds, peak traced bytes, output) for an encoder"""
+	best = float("inf")
+	output = ""
+	for _ in range(repeat):
+		gc.collect()
+		start = time.perf_counter()
+		output = encode(payload)
+		best = min(best, time.perf_counter() - start)
+
+	gc.collect()
+	tracemalloc.start()
+	encode(payload)
+	_, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	return best, peak, output
+
+
+def main() -> None:
+	node_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+	repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+	payload = build_payload(node_count)
+
+	before_time, before_peak, before_output = measure(two_pass, payload, repeat)
+	after_time, after_peak, after_output = measure(safe_dumps, payload, repeat)
+
+	assert before_output == after_output, "encoders produced different JSON"
+
+	print(f"nodes:       {node_count}")
+	print(f"output size: {len(after_output) / 1e6:.2f} MB")
+	print(
+		f"two-pass:    {before_time * 1e3:.1f} ms, "
+		f"peak {before_peak / 1e6:.2f} MB traced"
+	)
+	print(
+		f"single-pass: {after_time * 1e3:.1f} ms, peak {after_peak / 1e6:.2f} MB traced"
+	)
+	print(
+		f"speedup:     {before_time / after_time:.1f}x, "
+		f"allocation peak {after_peak / before_peak:.0%} of before"
+	)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,132 @@
+"""
+Benchmark for node_layout.first_free_cell
+
+Places random boxes, then asks for the first free grid cell with both the
+reference ``first_free_cell_scan`` (every candidate cell against every box) and
+``first_free_cell`` (OccupancyGrid). Asserts that both return identical
+positions and prints timings.
+
+Runs outside TouchDesigner (no ``td`` import is needed):
+
+    python scripts/bench_node_layout.py [box_count] [query_count]
+"""
+
+import importlib.util
+import os
+import random
+import sys
+import time
+
+MODULES_PATH = os.path.join(os.path.dirname(__file__), "..", "td", "modules")
+
+# Load the layout module directly: importing it through `mcp.services` would
+# pull in the API service, which requires TouchDesigner's `td` module.
+_spec = importlib.util.spec_from_file_location(
+	"node_layout",
+	os.path.join(MODULES_PATH, "mcp", "services", "node_layout.py"),
+)
+node_layout = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(node_layout)
+
+first_free_cell = node_layout.first_free_cell
+first_free_cell_scan = node_layout.first_free_cell_scan
+
+
+def build_boxes(rng: random.Random, count: int, spread: float) -> list:
+	"""Random node boxes, a third of them snapped to the default grid"""
+	boxes = []
+	for _ in range(count):
+		width = rng.choice((130.0, 130.0, 200.0, rng.uniform(20, 400)))
+		height = rng.choice((90.0, 90.0, 150.0, rng.uniform(20, 300)))
+		if rng.random() < 0.33:
+			# Exactly on grid cells, so clearance lands on the gap boundary
+			col = rng.randrange(node_layout.DEFAULT_COLS)
+			row = rng.randrange(int(spread / 110))
+			x = col * (130.0 + node_layout.DEFAULT_GAP)
+			y = -row * (90.0 + node_layout.DEFAULT_GAP)
+		else:
+			x = rng.uniform(-200, 900)
+			y = rng.uniform(-spread, 200)
+		boxes.append((x, y, width, height))
+	return boxes
+
+
+def build_packed_boxes(rng: random.Random, count: int) -> list:
+	"""Default-size nodes filling the first ``count`` grid cells, shuffled
+
+	This is the network first_free_cell itself produces, and the worst case
+	for the scan: every cell before the answer is tested against ~count/2 boxes.
+	"""
+	boxes = [
+		(
+			(k % node_layout.DEFAULT_COLS) * (130.0 + node_layout.DEFAULT_GAP),
+			-(k // node_layout.DEFAULT_COLS) * (90.0 + node_layout.DEFAULT_GAP),
+			130.0,
+			90.0,
+		)
+		for k in range(count)
+	]
+	rng.shuffle(boxes)
+	return boxes
+
+
+def build_queries(rng: random.Random, count: int) -> list:
+	"""Cell sizes, column counts, gaps and origins to query with"""
+	queries = [(130.0, 90.0, node_layout.DEFAULT_COLS, node_layout.DEFAULT_GAP)]
+	while len(queries) < count:
+		queries.append(
+			(
+				rng.choice((130.0, 200.0, rng.uniform(10, 300))),
+				rng.choice((90.0, 150.0, rng.uniform(10, 200))),
+				rng.choice((1, 3, 5, 8)),
+				rng.choice((0.0, 20.0, rng.uniform(0, 50))),
+			)
+		)
+	return queries
+
+
+def run(name: str, boxes: list, queries: list) -> None:
+	scan_time = 0.0
+	grid_time = 0.0
+	for width, height, cols, gap in queries:
+		start = time.perf_counter()
+		expected = first_free_cell_scan(boxes, width, height, cols, gap)
+		scan_time += time.perf_counter() - start
+
+		start = time.perf_counter()
+		actual = first_free_cell(boxes, width, height, cols, gap)
+		grid_time += time.perf_counter() - start
+
+		assert actual == expected, (
+			f"mismatch for cell {width}x{height} cols={cols} gap={gap}: "
+			f"{actual} != {expected}"
+		)
+
+	print(f"[{name}]")
+	print(f"boxes:       {len(boxes)}")
+	print(f"queries:     {len(queries)}")
+	print(
+		f"scan:        {scan_time:.3f} s ({scan_time / len(queries) * 1e3:.2f} ms/query)"
+	)
+	print(
+		f"grid:        {grid_time:.3f} s ({grid_time / len(queries) * 1e3:.2f} ms/query)"
+	)
+	print(f"speedup:     {scan_time / grid_time:.1f}x")
+
+
+def main() -> None:
+	box_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+	query_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+	rng = random.Random(0)
+	# Dense enough that the first free cell is many rows down
+	boxes = build_boxes(rng, box_count, spread=box_count * 8.0)
+	run("random", boxes, build_queries(rng, query_count))
+
+	# The scan is quadratic here; cap the size so the reference finishes
+	packed = build_packed_boxes(rng, min(box_count, 3_000))
+	run("packed", packed, build_queries(rng, 3))
+
+
+if __name__ == "__main__":
+	main()
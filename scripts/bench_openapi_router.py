@@ -0,0 +1,132 @@
+"""
+Micro-benchmark for OpenAPIRouter route matching
+
+Routes a few hundred thousand synthetic requests through the linear
+``match_route`` scan and the ``CompiledRouteTable`` built at router startup,
+asserts that both return identical ``RouteMatch`` results, and prints timings.
+
+Runs outside TouchDesigner (no ``td`` import is needed):
+
+    python scripts/bench_openapi_router.py [request_count] [operation_count]
+"""
+
+import importlib.util
+import os
+import random
+import sys
+import time
+
+MODULES_PATH = os.path.join(os.path.dirname(__file__), "..", "td", "modules")
+sys.path.insert(0, os.path.abspath(MODULES_PATH))
+
+# Load the router module directly: importing it through `mcp.controllers`
+# would pull in the API service, which requires TouchDesigner's `td` module.
+_spec = importlib.util.spec_from_file_location(
+	"openapi_router",
+	os.path.join(MODULES_PATH, "mcp", "controllers", "openapi_router.py"),
+)
+openapi_router = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(openapi_router)
+
+CompiledRouteTable = openapi_router.CompiledRouteTable
+RouteDefinition = openapi_router.RouteDefinition
+match_route = openapi_router.match_route
+
+
+def build_routes(operation_count: int) -> list:
+	"""Build a schema-shaped route list mixing static and templated paths"""
+	routes = []
+	shapes = (
+		("GET", "/api/v{group}/items"),
+		("POST", "/api/v{group}/items"),
+		("GET", "/api/v{group}/items/detail"),
+		("GET", "/api/v{group}/items/{{itemId}}"),
+		("PATCH", "/api/v{group}/items/{{itemId}}/children"),
+		("GET", "/api/v{group}/nodes/{{nodePath}}"),
+		("DELETE", "/api/v{group}/classes/{{className}}"),
+	)
+	group = 0
+	while len(routes) < operation_count:
+		for method, template in shapes:
+			path = template.format(group=group)
+			routes.append(
+				RouteDefinition(
+					method=method,
+					path_pattern=path,
+					operation_id=f"op_{len(routes)}",
+				)
+			)
+			if len(routes) == operation_count:
+				break
+		group += 1
+	return routes
+
+
+def build_requests(routes: list, request_count: int, seed: int = 0) -> list:
+	"""Generate hits, greedy node paths, prefix paths and misses"""
+	rng = random.Random(seed)
+	methods = ("GET", "POST", "PATCH", "DELETE", "get")
+	requests = []
+	for _ in range(request_count):
+		route = rng.choice(routes)
+		parts = route.path_pattern.split("/")
+		filled = [
+			f"value{rng.randrange(1000)}" if "{" in part else part for part in parts
+		]
+		roll = rng.random()
+		if roll < 0.2:
+			# Greedy capture of a nested TouchDesigner node path
+			filled.extend(["project1", f"geo{rng.randrange(50)}", "null1"])
+		elif roll < 0.3:
+			filled.append("")
+		elif roll < 0.4:
+			filled[-1] = "unknown"
+		path = "/".join(filled)
+		method = route.method if rng.random() < 0.9 else rng.choice(methods)
+		requests.append((method, path))
+	return requests
+
+
+def main() -> None:
+	request_count = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+	operation_count = int(sys.argv[2]) if len(sys.argv) > 2 else 120
+
+	routes = build_routes(operation_count)
+	requests = build_requests(routes, request_count)
+
+	start = time.perf_counter()
+	table = CompiledRouteTable(routes)
+	compile_time = time.perf_counter() - start
+
+	start = time.perf_counter()
+	linear_results = [match_route(method, path, routes) for method, path in requests]
+	linear_time = time.perf_counter() - start
+
+	start = time.perf_counter()
+	compiled_results = [table.match(method, path) for method, path in requests]
+	compiled_time = time.perf_counter() - start
+
+	mismatches = [
+		(request, expected, actual)
+		for request, expected, actual in zip(requests, linear_results, compiled_results)
+		if expected != actual
+	]
+	assert not mismatches, f"{len(mismatches)} mismatches, first: {mismatches[0]}"
+
+	matched = sum(1 for result in compiled_results if result is not None)
+	print(f"routes:      {len(routes)}")
+	print(f"requests:    {len(requests)} ({matched} matched)")
+	print(f"compile:     {compile_time * 1e3:.2f} ms")
+	print(
+		f"match_route: {linear_time:.3f} s "
+		f"({linear_time / len(requests) * 1e6:.2f} us/request)"
+	)
+	print(
+		f"compiled:    {compiled_time:.3f} s "
+		f"({compiled_time / len(requests) * 1e6:.2f} us/request)"
+	)
+	print(f"speedup:     {linear_time / compiled_time:.1f}x")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,165 @@
+"""
+Check for batch node layout (deferred_layout)
+
+Runs batches through the real API controller, router and service against a
+minimal stand-in for TouchDesigner's ``td`` module, and asserts that:
+
+- nodes created in one run of create_node entries get the same positions as
+  creating them one by one
+- a position set by a later batch entry (update_node nodeX/nodeY) is kept,
+  and nodes created after it are laid out around it
+
+Runs outside TouchDesigner:
+
+    python scripts/check_batch_layout.py
+"""
+
+import json
+import os
+import sys
+import types
+
+MODULES_PATH = os.path.join(os.path.dirname(__file__), "..", "td", "modules")
+sys.path.insert(0, os.path.abspath(MODULES_PATH))
+
+
+class FakePars:
+	"""Node without parameters: every name falls through to node attributes"""
+
+	def __getattr__(self, name):
+		raise AttributeError(name)
+
+
+class FakeOP:
+	"""Just enough of td.OP for create_node, update_node and node layout"""
+
+	def __init__(self, path, op_type="baseCOMP"):
+		self.path = path
+		self.name = path.rsplit("/", 1)[-1]
+		self.id = len(_ops)
+		self.OPType = op_type
+		self.valid = True
+		self.nodeX = 0
+		self.nodeY = 0
+		self.nodeWidth = 130
+		self.nodeHeight = 90
+		self.par = FakePars()
+		self.children = []
+		_ops[path] = self
+
+	def create(self, op_type, name=None):
+		child = FakeOP(f"{self.path}/{name or op_type + str(len(self.children))}")
+		child.OPType = op_type
+		self.children.append(child)
+		return child
+
+	def pars(self, *patterns):
+		return []
+
+
+_ops: dict = {}
+
+td = types.ModuleType("td")
+td.OP = FakeOP
+td.op = _ops.get
+sys.modules["td"] = td
+
+# The real handlers are generated from the OpenAPI schema at build time; the
+# check registers its own below, so an empty module is enough here.
+generated_handlers = types.ModuleType("mcp.controllers.generated_handlers")
+generated_handlers.__all__ = []
+sys.modules["mcp.controllers.generated_handlers"] = generated_handlers
+
+import utils.config  # noqa: E402
+
+utils.config.DEBUG = False
+
+from mcp.controllers.api_controller import APIControllerOpenAPI  # noqa: E402
+from mcp.controllers.openapi_router import BATCH_OPERATION_ID  # noqa: E402
+from mcp.services.api_service import TouchDesignerApiService  # noqa: E402
+
+service = TouchDesignerApiService()
+controller = APIControllerOpenAPI(service)
+controller.router.register_handler("create_node", service.create_node)
+controller.router.register_handler("update_node", service.update_node)
+
+
+def new_project():
+	_ops.clear()
+	return FakeOP("/project1")
+
+
+def run_batch(operations: list) -> None:
+	result = controller.router._handlers[BATCH_OPERATION_ID](
+		body=json.dumps({"operations": operations})
+	)
+	assert result["success"], result
+	for item in result["data"]["results"]:
+		assert item["success"], item
+
+
+def create(name: str) -> dict:
+	return {
+		"operationId": "create_node",
+		"params": {
+			"parent_path": "/project1",
+			"node_type": "noiseTOP",
+			"node_name": name,
+		},
+	}
+
+
+def move(name: str, x: float, y: float) -> dict:
+	return {
+		"operationId": "update_node",
+		"params": {
+			"node_path": f"/project1/{name}",
+			"properties": {"nodeX": x, "nodeY": y},
+		},
+	}
+
+
+def positions(project) -> list:
+	return [(child.name, child.nodeX, child.nodeY) for child in project.children]
+
+
+def placed(project) -> dict:
+	return {name: (x, y) for name, x, y in positions(project)}
+
+
+def check_matches_one_by_one() -> None:
+	names = [f"n{i}" for i in range(12)]
+
+	project = new_project()
+	for name in names:
+		service.create_node("/project1", "noiseTOP", name)
+	expected = positions(project)
+
+	project = new_project()
+	run_batch([create(name) for name in names])
+	assert positions(project) == expected, (positions(project), expected)
+	print("create run:          ok")
+
+
+def check_update_after_create() -> None:
+	project = new_project()
+	run_batch([create("a"), move("a", 5000, 5000), create("b"), create("c")])
+	at = placed(project)
+	assert at["a"] == (5000, 5000), at
+	assert at["b"] == (0, 0) and at["c"] == (150, 0), at
+
+	project = new_project()
+	run_batch([create("a"), move("a", 0, 0), create("b")])
+	at = placed(project)
+	assert at["a"] == (0, 0), at
+	assert at["b"] != (0, 0), at
+	print("update after create: ok")
+
+
+def main() -> None:
+	check_matches_one_by_one()
+	check_update_after_create()
+
+
+if __name__ == "__main__":
+	main()
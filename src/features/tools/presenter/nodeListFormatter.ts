@@ -27,6 +27,8 @@ export interface NodeListData {
 	parentPath?: string;
 	pattern?: string;
 	includeProperties?: boolean;
+	nextCursor?: string | null;
+	totalCount?: number;
 	[key: string]: unknown;
 }
 
@@ -40,6 +42,7 @@ interface NodeListContext {
 	}>;
 	truncated: boolean;
 	omittedCount: number;
+	nextCursor?: string;
 }
 
 interface TextWithContext {
@@ -83,12 +86,18 @@ export function formatNodeList(
 	if (hintEnabled) {
 		output += formatOmissionHint(totalCount, limitedNodes.length, "node");
 	}
+	if (data.nextCursor) {
+		output += formatNextPageHint(data.nextCursor);
+	}
 
 	const context = result.context as unknown as Record<string, unknown>;
 	context.truncated = hintEnabled;
 	if (!hintEnabled) {
 		context.omittedCount = 0;
 	}
+	if (data.nextCursor) {
+		context.nextCursor = data.nextCursor;
+	}
 	return finalizeFormattedText(output, opts, {
 		context,
 		structured: context,
@@ -170,6 +179,13 @@ function formatDetailed(
 	);
 }
 
+/**
+ * Hint for fetching the next server-side page of nodes
+ */
+function formatNextPageHint(nextCursor: string): string {
+	return `\n➡️ More nodes available. Pass cursor="${nextCursor}" to fetch the next page.`;
+}
+
 function buildNodeListContext(
 	nodes: TdNode[],
 	parentPath: string,
@@ -177,7 +177,7 @@ await executePythonScript({
 });`,
 		name: TOOL_NAMES.EXECUTE_PYTHON_SCRIPT,
 		notes:
-			"Wrap long-running scripts with logging so the agent can stream intermediate checkpoints.",
+			"Wrap long-running scripts with logging so the agent can stream intermediate checkpoints. Pass the same sessionId across calls to keep helper functions, imports and intermediate values instead of resending them.",
 		returns:
 			"Result payload that mirrors `result` from the executed script (if set).",
 		run: async ({ params, tdClient, logger }) => {
@@ -200,7 +200,7 @@ await executePythonScript({
 	defineTool({
 		category: "nodes",
 		description:
-			"List nodes under a path with token-optimized output (detailLevel+limit supported)",
+			"List nodes under a path with token-optimized output (detailLevel+limit supported, paginate with cursor)",
 		errorComment: REFERENCE_COMMENT,
 		example: `import { getTdNodes } from './servers/touchdesigner/getTdNodes';
 
@@ -214,7 +214,9 @@ console.log(nodes.nodes?.map(node => node.path));`,
 			"Set of nodes (id, opType, name, path, optional properties) under parentPath.",
 		run: async ({ params, tdClient }) => {
 			const { detailLevel, limit, responseFormat, ...queryParams } = params;
-			const result = await tdClient.getNodes(queryParams);
+			// `limit` doubles as the TouchDesigner page size, so only one page of
+			// nodes is evaluated; follow `nextCursor` via `cursor` for more.
+			const result = await tdClient.getNodes({ ...queryParams, limit });
 			if (!result.success) {
 				throw result.error;
 			}
@@ -426,7 +428,11 @@ console.log(textTop.methods?.length);`,
 			"Deep description of a Python class including methods and properties.",
 		run: async ({ params, tdClient }) => {
 			const { className, detailLevel, limit, responseFormat } = params;
-			const result = await tdClient.getClassDetails(className);
+			// Minimal output only reports member counts, so skip docstrings
+			const result = await tdClient.getClassDetails(
+				className,
+				detailLevel === "minimal" ? { summary: true } : undefined,
+			);
 			if (!result.success) {
 				throw result.error;
 			}
@@ -449,8 +455,8 @@ console.log(docs.helpText?.slice(0, 200));`,
 		name: TOOL_NAMES.GET_TD_MODULE_HELP,
 		returns: "Captured Python help() output with formatter context.",
 		run: async ({ params, tdClient }) => {
-			const { detailLevel, moduleName, responseFormat } = params;
-			const result = await tdClient.getModuleHelp({ moduleName });
+			const { detailLevel, responseFormat, ...helpParams } = params;
+			const result = await tdClient.getModuleHelp(helpParams);
 			if (!result.success) {
 				throw result.error;
 			}
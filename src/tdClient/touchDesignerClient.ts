@@ -33,6 +33,7 @@ import {
 	type GetNodeDetailParams,
 	type GetNodeErrorsParams,
 	type GetNodesParams,
+	type GetTdPythonClassDetailsParams,
 	type UpdateNodeBody,
 } from "../gen/endpoints/TouchDesignerAPI.js";
 
@@ -437,10 +438,13 @@ export class TouchDesignerClient {
 	/**
 	 * Get details of a specific class/module
 	 */
-	async getClassDetails(className: string) {
+	async getClassDetails(
+		className: string,
+		params?: GetTdPythonClassDetailsParams,
+	) {
 		return this.apiCall(
 			"Getting class details",
-			() => this.api.getTdPythonClassDetails(className),
+			() => this.api.getTdPythonClassDetails(className, params),
 			{ className },
 		);
 	}
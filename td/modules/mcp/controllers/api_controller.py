@@ -5,21 +5,31 @@ This controller uses the OpenAPIRouter to route requests based on the OpenAPI sc
 and converts between API models and internal data structures.
 """
 
+from contextlib import AbstractContextManager
 import json
 import traceback
 from typing import Any, Optional, Protocol
 
 from mcp.controllers.generated_handlers import *
-from mcp.controllers.openapi_router import OpenAPIRouter
+from mcp.controllers.openapi_router import BATCH_OPERATION_ID, OpenAPIRouter
 from utils.error_handling import ErrorCategory
 from utils.logging import log_message
-from utils.serialization import safe_serialize
-from utils.types import LogLevel, Result
+from utils.serialization import safe_dumps
+from utils.types import BinaryPayload, LogLevel, Result
 
 
 class ApiServiceProtocol(Protocol):
 	"""Protocol defining the API service interface"""
 
+	def build_graph(
+		self,
+		parent_path: str,
+		nodes: list[dict[str, Any]],
+		edges: Optional[list[dict[str, Any]]] = None,
+		rollback: bool = False,
+		full_summary: bool = False,
+	) -> Result: ...
+
 	def call_node_method(
 		self,
 		node_path: str,
@@ -28,6 +38,8 @@ class ApiServiceProtocol(Protocol):
 		kwargs: dict[str, Any] = None,
 	) -> Result: ...
 
+	def close_script_session(self, session_id: str) -> Result: ...
+
 	def create_node(
 		self,
 		parent_path: str,
@@ -36,10 +48,40 @@ class ApiServiceProtocol(Protocol):
 		parameters: Optional[dict[str, Any]] = None,
 	) -> Result: ...
 
+	def deferred_layout(self) -> AbstractContextManager[None]: ...
+
 	def delete_node(self, node_path: str) -> Result: ...
 
+	def delete_procedure(self, procedure_id: str) -> Result: ...
+
 	def exec_script(self, script: str) -> Result: ...
 
+	def exec_python_script(
+		self, script: str, session_id: Optional[str] = None
+	) -> Result: ...
+
+	def flush_deferred_layout(self) -> None: ...
+
+	def gather_parameters(
+		self,
+		parameters: Any,
+		paths: Optional[list[str]] = None,
+		parent_path: Optional[str] = None,
+		pattern: Optional[str] = None,
+		op_type: Optional[str] = None,
+		recursive: bool = False,
+	) -> Result: ...
+
+	def get_chop_data(
+		self,
+		node_path: str,
+		channels: Optional[str] = None,
+		start: Optional[int] = None,
+		end: Optional[int] = None,
+		step: Optional[int] = None,
+		encoding: str = "binary",
+	) -> Result: ...
+
 	def get_td_info(self) -> Result: ...
 
 	def get_nodes(
@@ -47,20 +89,107 @@ class ApiServiceProtocol(Protocol):
 		parent_path: str,
 		pattern: Optional[str] = None,
 		include_properties: bool = False,
+		limit: Optional[int] = None,
+		cursor: Optional[str] = None,
+		parameters: Optional[str] = None,
+		pages: Optional[str] = None,
+		non_default_only: bool = False,
 	) -> Result: ...
 
-	def get_module_help(self, module_name: str) -> Result: ...
+	def get_module_help(
+		self,
+		module_name: str,
+		section: Optional[str] = None,
+		offset: Optional[int] = None,
+		length: Optional[int] = None,
+	) -> Result: ...
 
-	def get_node_detail(self, node_path: str) -> Result: ...
+	def get_node_detail(
+		self,
+		node_path: str,
+		parameters: Optional[str] = None,
+		pages: Optional[str] = None,
+		non_default_only: bool = False,
+	) -> Result: ...
 
 	def get_node_errors(self, node_path: str) -> Result: ...
 
-	def get_td_python_class_details(self, class_name: str) -> Result: ...
+	def get_parameter_catalog(
+		self,
+		op_type: Optional[str] = None,
+		node_path: Optional[str] = None,
+		if_none_match: Optional[str] = None,
+	) -> Result: ...
+
+	def get_parameter_delta(
+		self,
+		node_path: str,
+		since: Optional[str] = None,
+		parameters: Optional[str] = None,
+		pages: Optional[str] = None,
+		non_default_only: bool = False,
+	) -> Result: ...
 
-	def get_td_python_classes(self) -> Result: ...
+	def get_script_sessions(self) -> Result: ...
+
+	def get_table_data(
+		self,
+		node_path: str,
+		row_start: Optional[int] = None,
+		row_end: Optional[int] = None,
+		col_start: Optional[int] = None,
+		col_end: Optional[int] = None,
+		layout: str = "rows",
+		encoding: str = "json",
+	) -> Result: ...
+
+	def get_top_image(
+		self,
+		node_path: str,
+		format: str = "jpg",
+		quality: Optional[int] = None,
+		max_size: Optional[int] = None,
+		encoding: str = "binary",
+	) -> Result: ...
+
+	def get_td_python_class_details(
+		self, class_name: str, summary: bool = False, member: Optional[str] = None
+	) -> Result: ...
+
+	def get_td_python_classes(self, if_none_match: Optional[str] = None) -> Result: ...
+
+	def invoke_procedure(
+		self, procedure_id: str, args: Optional[dict[str, Any]] = None
+	) -> Result: ...
+
+	def register_procedure(
+		self, code: str, parameters: str = "", name: Optional[str] = None
+	) -> Result: ...
+
+	def release_shared_memory(self, lease_id: str) -> Result: ...
 
 	def update_node(self, node_path: str, properties: dict[str, Any]) -> Result: ...
 
+	def update_nodes(
+		self,
+		parent_path: Optional[str] = None,
+		pattern: Optional[str] = None,
+		op_type: Optional[str] = None,
+		recursive: bool = False,
+		properties: Optional[dict[str, Any]] = None,
+		updates: Optional[dict[str, dict[str, Any]]] = None,
+		details: bool = False,
+	) -> Result: ...
+
+	def update_table_data(
+		self,
+		node_path: str,
+		values: list[list[Any]],
+		row: int = 0,
+		col: int = 0,
+		truncate: bool = False,
+	) -> Result: ...
+
 
 class RequestProcessor:
 	"""
@@ -283,7 +412,13 @@ class APIControllerOpenAPI(IController):
 			if result["success"]:
 				response["statusCode"] = 200
 				response["statusReason"] = "OK"
-				response["data"] = json.dumps(safe_serialize(result))
+				payload = result.get("data")
+				if isinstance(payload, BinaryPayload):
+					response["headers"].update(payload.headers)
+					response["headers"]["Content-Type"] = payload.content_type
+					response["data"] = payload.content
+				else:
+					response["data"] = safe_dumps(result)
 			else:
 				error_category = result.get("errorCategory", ErrorCategory.VALIDATION)
 				response["statusCode"] = 200
@@ -317,8 +452,11 @@ class APIControllerOpenAPI(IController):
 				}
 			)
 
+		logged_data = response["data"]
+		if isinstance(logged_data, bytes):
+			logged_data = f"<{len(logged_data)} bytes>"
 		log_message(
-			f"Response status: {response['statusCode']}, {response['data']}",
+			f"Response status: {response['statusCode']}, {logged_data}",
 			LogLevel.DEBUG,
 		)
 		return response
@@ -366,15 +504,33 @@ class APIControllerOpenAPI(IController):
 			return "Internal Server Error"
 
 	def register_handlers(self) -> None:
-		"""Register all generated handlers automatically"""
+		"""Register all generated handlers automatically, plus the batch handler"""
 		import mcp.controllers.generated_handlers as handlers
 
 		for operation_id in handlers.__all__:
+			if operation_id == BATCH_OPERATION_ID:
+				continue
 			handler = getattr(handlers, operation_id, None)
 			if callable(handler):
 				self.router.register_handler(operation_id, handler)
 			else:
 				log_message(f"Handler for {operation_id} not found.", LogLevel.WARNING)
 
+		# Batches fan out to the handlers above, so the router serves them itself
+		# instead of a service method.
+		self.router.register_handler(BATCH_OPERATION_ID, self._handle_batch)
+
+	def _handle_batch(self, **kwargs) -> Result:
+		"""Run a batch, laying out each run of consecutive node creations in one pass"""
+		with self._service.deferred_layout():
+			return self.router.handle_batch(
+				before_entry=self._before_batch_entry, **kwargs
+			)
+
+	def _before_batch_entry(self, operation_id: Any) -> None:
+		"""Place queued new nodes before any operation that could read or move them"""
+		if operation_id != "create_node":
+			self._service.flush_deferred_layout()
+
 
 api_controller_openapi = APIControllerOpenAPI()
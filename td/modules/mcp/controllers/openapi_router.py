@@ -4,20 +4,27 @@ OpenAPI schema based router for TouchDesigner MCP Web Server
 This module provides utilities to:
 - Load OpenAPI schema
 - Extract route definitions
-- Match incoming requests to routes
+- Match incoming requests to routes (via a dispatch table compiled at startup)
 - Call registered handler functions based on operationId
+- Dispatch batches of operations within a single request
 """
 
+from collections.abc import Callable
 from dataclasses import dataclass, field
+import json
 import traceback
 from typing import Any, NamedTuple, Optional, Protocol
 
 from mcp import openapi_schema
 from utils.error_handling import ErrorCategory, categorize_error, format_error
 from utils.logging import log_message
-from utils.result import error_result
+from utils.params import is_truthy
+from utils.result import error_result, success_result
 from utils.types import LogLevel, Result
 
+BATCH_OPERATION_ID = "execute_batch"
+MAX_BATCH_OPERATIONS = 200
+
 
 @dataclass
 class RouteDefinition:
@@ -157,6 +164,103 @@ def match_route(
 	return None
 
 
+@dataclass
+class _RouteNode:
+	"""Segment trie node used by :class:`CompiledRouteTable`"""
+
+	static: dict[str, "_RouteNode"] = field(default_factory=dict)
+	param: Optional["_RouteNode"] = None
+	terminals: list[tuple[int, RouteDefinition, tuple[tuple[int, str], ...]]] = field(
+		default_factory=list
+	)
+
+
+class CompiledRouteTable:
+	"""
+	Dispatch table compiled once from a list of route definitions
+
+	Static paths are resolved with a per-method dict lookup. Templated paths are
+	stored in a per-method segment trie, so matching costs O(path segments)
+	instead of O(routes). Results are identical to :func:`match_route`: the
+	earliest declared route wins, a trailing ``{param}`` greedily captures the
+	remaining segments (e.g. node paths), and templated routes match on a
+	segment prefix of the request path.
+	"""
+
+	def __init__(self, routes: list[RouteDefinition]):
+		self._static: dict[str, dict[str, RouteDefinition]] = {}
+		self._templated: dict[str, _RouteNode] = {}
+
+		for index, route in enumerate(routes):
+			self._static.setdefault(route.method, {}).setdefault(
+				route.path_pattern, route
+			)
+			if "{" in route.path_pattern:
+				self._insert(index, route)
+
+	def _insert(self, index: int, route: RouteDefinition) -> None:
+		node = self._templated.setdefault(route.method, _RouteNode())
+		param_slots = []
+		for position, part in enumerate(route.path_pattern.split("/")):
+			if "{" in part and "}" in part:
+				param_slots.append((position, part[1:-1]))
+				if node.param is None:
+					node.param = _RouteNode()
+				node = node.param
+			else:
+				node = node.static.setdefault(part, _RouteNode())
+		node.terminals.append((index, route, tuple(param_slots)))
+
+	def match(self, method: str, path: str) -> Optional[RouteMatch]:
+		"""
+		Match request method and path against the compiled table
+
+		Args:
+		    method: HTTP method of the request (GET, POST, etc.)
+		    path: URL path of the request
+
+		Returns:
+		    RouteMatch if a matching route is found, None otherwise
+		"""
+		method = method.upper()
+
+		static_route = self._static.get(method, {}).get(path)
+		if static_route is not None:
+			return RouteMatch(route=static_route, path_params={})
+
+		root = self._templated.get(method)
+		if root is None:
+			return None
+
+		path_parts = path.split("/")
+		best = None
+		stack = [(root, 0)]
+		while stack:
+			node, depth = stack.pop()
+			for terminal in node.terminals:
+				if best is None or terminal[0] < best[0][0]:
+					best = (terminal, depth)
+			if depth == len(path_parts):
+				continue
+			child = node.static.get(path_parts[depth])
+			if child is not None:
+				stack.append((child, depth + 1))
+			if node.param is not None:
+				stack.append((node.param, depth + 1))
+
+		if best is None:
+			return None
+
+		(_, route, param_slots), depth = best
+		path_params = {}
+		for position, name in param_slots:
+			if position == depth - 1 and depth < len(path_parts):
+				path_params[name] = "/".join(path_parts[position:])
+			else:
+				path_params[name] = path_parts[position]
+		return RouteMatch(route=route, path_params=path_params)
+
+
 class RequestHandler(Protocol):
 	"""Protocol for request handlers"""
 
@@ -202,6 +306,8 @@ class OpenAPIRouter:
 		else:
 			self._routes_by_operation_id: dict[str, RouteDefinition] = {}
 
+		self._route_table = CompiledRouteTable(self.routes)
+
 	def register_handler(self, operation_id: str, handler: RequestHandler) -> None:
 		"""
 		Register a handler for an operation
@@ -233,7 +339,7 @@ class OpenAPIRouter:
 		    Result of the handler execution
 		"""
 		try:
-			match = match_route(method, path, self.routes)
+			match = self._route_table.match(method, path)
 			if not match:
 				error_msg = f"No route matched for {method} {path}"
 				log_message(error_msg, LogLevel.WARNING)
@@ -256,8 +362,155 @@ class OpenAPIRouter:
 			if method.upper() in ["POST", "PUT", "PATCH"] and body:
 				params["body"] = body
 
-			return handler(**params)
+			return self._call_handler(handler, params)
+
+		except Exception as e:
+			error_msg = f"Handler execution error: {str(e)}"
+			error_category = categorize_error(e)
+			log_message(error_msg, LogLevel.ERROR)
+			log_message(traceback.format_exc(), LogLevel.DEBUG)
+			return error_result(
+				format_error(error_msg, error_category),
+				{"errorCategory": error_category},
+			)
+
+	def execute_batch(
+		self,
+		operations: list[dict[str, Any]],
+		stop_on_error: bool = False,
+		before_entry: Optional[Callable[[Any], None]] = None,
+	) -> Result:
+		"""
+		Dispatch an ordered list of operations through the registered handlers
+
+		Args:
+		    operations: Entries of the form {"operationId": str, "params": dict}
+		    stop_on_error: Stop at the first failed operation if True
+		    before_entry: Called with each entry's operationId before it runs
+
+		Returns:
+		    Result with one per-operation Result for every executed entry
+		"""
+		if not isinstance(operations, list):
+			return error_result(
+				format_error("operations must be a list", ErrorCategory.VALIDATION),
+				{"errorCategory": ErrorCategory.VALIDATION},
+			)
+		if len(operations) > MAX_BATCH_OPERATIONS:
+			return error_result(
+				format_error(
+					f"Batch exceeds {MAX_BATCH_OPERATIONS} operations "
+					f"({len(operations)} given)",
+					ErrorCategory.VALIDATION,
+				),
+				{"errorCategory": ErrorCategory.VALIDATION},
+			)
+
+		results = []
+		stopped = False
+		for index, entry in enumerate(operations):
+			if before_entry is not None:
+				before_entry(
+					entry.get("operationId") if isinstance(entry, dict) else None
+				)
+			item = self._execute_batch_entry(index, entry)
+			results.append(item)
+			if stop_on_error and not item["success"]:
+				stopped = index < len(operations) - 1
+				break
+
+		log_message(
+			f"Batch executed {len(results)}/{len(operations)} operations",
+			LogLevel.DEBUG,
+		)
+		return success_result(
+			{
+				"results": results,
+				"total": len(operations),
+				"executed": len(results),
+				"stopped": stopped,
+			}
+		)
+
+	def handle_batch(
+		self,
+		body: Optional[str] = None,
+		before_entry: Optional[Callable[[Any], None]] = None,
+		**kwargs,
+	) -> Result:
+		"""
+		Request handler for the batch operation
+
+		Args:
+		    body: JSON request body containing operations and stopOnError
+		    before_entry: Passed through to execute_batch
+		    kwargs: Query parameters, merged under the body values
 
+		Returns:
+		    Result of execute_batch
+		"""
+		if body:
+			try:
+				kwargs.update(json.loads(body))
+			except Exception as e:
+				return error_result(
+					format_error(
+						f"Invalid JSON body: {str(e)}", ErrorCategory.VALIDATION
+					),
+					{"errorCategory": ErrorCategory.VALIDATION},
+				)
+
+		return self.execute_batch(
+			kwargs.get("operations", []),
+			stop_on_error=is_truthy(kwargs.get("stopOnError", False)),
+			before_entry=before_entry,
+		)
+
+	def _execute_batch_entry(self, index: int, entry: Any) -> dict[str, Any]:
+		"""Run a single batch entry and flatten its Result for the response"""
+		if not isinstance(entry, dict):
+			entry = {}
+		operation_id = entry.get("operationId")
+		params = entry.get("params") or {}
+
+		if not operation_id or not isinstance(params, dict):
+			result = error_result(
+				format_error(
+					f"Invalid batch entry at index {index}: expected "
+					"{operationId: string, params?: object}",
+					ErrorCategory.VALIDATION,
+				),
+				{"errorCategory": ErrorCategory.VALIDATION},
+			)
+		elif operation_id == BATCH_OPERATION_ID:
+			result = error_result(
+				format_error("Batches cannot be nested", ErrorCategory.VALIDATION),
+				{"errorCategory": ErrorCategory.VALIDATION},
+			)
+		elif operation_id not in self._handlers:
+			result = error_result(
+				format_error(
+					f"No handler registered for operation: {operation_id}",
+					ErrorCategory.NOT_FOUND,
+				),
+				{"errorCategory": ErrorCategory.NOT_FOUND},
+			)
+		else:
+			result = self._call_handler(self._handlers[operation_id], params)
+
+		error_category = result.get("errorCategory")
+		return {
+			"operationId": operation_id,
+			"success": bool(result.get("success")),
+			"data": result.get("data"),
+			"error": result.get("error"),
+			"errorCategory": str(error_category) if error_category else None,
+		}
+
+	def _call_handler(self, handler: RequestHandler, params: dict[str, Any]) -> Result:
+		"""Invoke a handler, converting exceptions into error Results"""
+		try:
+			return handler(**params)
 		except TypeError as e:
 			error_msg = f"Handler argument mismatch: {str(e)}"
 			log_message(error_msg, LogLevel.ERROR)
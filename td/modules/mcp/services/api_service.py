@@ -3,32 +3,112 @@ TouchDesigner MCP Web Server API Service Implementation
 Provides API functionality related to TouchDesigner
 """
 
+import ast
+import base64
+import bisect
+import builtins
+from collections import OrderedDict, deque
 import contextlib
+import fnmatch
+import hashlib
 import importlib
 import inspect
 import io
+import json
+from operator import itemgetter
 import pydoc
+import re
 import sys
+import time
 import traceback
+from types import CodeType
 from typing import Any, Optional, Protocol
 
-from mcp.services.node_layout import first_free_cell
+from mcp.services.bulk_params import BulkParameterWriter, gather_columns
+from mcp.services.chop_export import SAMPLE_DTYPE, pack_chop_block, read_chop_block
+from mcp.services.node_layout import first_free_cell, place_boxes
+from mcp.services.par_catalog import build_parameter_catalog
+from mcp.services.par_projection import (
+	ParameterDefaults,
+	ParameterProjection,
+	project_pars,
+	split_list,
+)
+from mcp.services.par_sync import ParameterSnapshotCache
+from mcp.services.preview_stream import PreviewStreamHub
+from mcp.services.procedures import (
+	ProcedureRegistry,
+	compile_procedure,
+	procedure_id_for,
+)
+from mcp.services.script_sessions import (
+	ScriptSession,
+	ScriptSessionStore,
+	is_valid_session_id,
+)
+from mcp.services.shared_memory import SharedMemoryPool
+from mcp.services.table_data import read_table, write_table
+from mcp.services.top_capture import IMAGE_FORMATS, SCALER_PREFIX, TopCapture
 import td
+from utils.config import SHARED_MEMORY_DIR
 from utils.logging import log_message
+from utils.params import is_truthy, optional_int
 from utils.result import error_result, success_result
 from utils.serialization import safe_serialize
-from utils.types import LogLevel, Result
+from utils.types import BinaryPayload, LogLevel, Result
 from utils.version import get_mcp_api_version
 
+# Hard upper bound on nodes returned by a single get_nodes page.
+GET_NODES_MAX_LIMIT = 1000
+
+# Number of inspected classes kept by get_td_python_class_details.
+CLASS_DETAILS_CACHE_SIZE = 64
+
+# Number of rendered help documents kept by get_module_help.
+MODULE_HELP_CACHE_SIZE = 32
+
+# Number of compiled scripts kept by exec_python_script.
+SCRIPT_CODE_CACHE_SIZE = 128
+
+# A character followed by a backspace, as pydoc emits for bold text ("c\bc").
+_BACKSPACE_PAIR = re.compile("[^\b]\b")
+
+
+def _check_encoding(encoding: Any, allowed: tuple[str, ...]) -> Optional[Result]:
+	"""Return an error result unless encoding is one of allowed"""
+	if encoding in allowed:
+		return None
+	choices = ", ".join(f"'{choice}'" for choice in allowed[:-1])
+	return error_result(f"encoding must be {choices} or '{allowed[-1]}'")
+
+
+def _is_scaler(node: Any) -> bool:
+	"""Whether a node is one of get_top_image's pooled scalers"""
+	return node.name.startswith(SCALER_PREFIX)
+
 
 class IApiService(Protocol):
 	"""API service interface"""
 
 	def get_td_info(self) -> Result: ...
-	def get_td_python_classes(self) -> Result: ...
-	def get_td_python_class_details(self, class_name: str) -> Result: ...
-	def get_module_help(self, module_name: str) -> Result: ...
-	def get_node_detail(self, node_path: str) -> Result: ...
+	def get_td_python_classes(self, if_none_match: Optional[str] = None) -> Result: ...
+	def get_td_python_class_details(
+		self, class_name: str, summary: bool = False, member: Optional[str] = None
+	) -> Result: ...
+	def get_module_help(
+		self,
+		module_name: str,
+		section: Optional[str] = None,
+		offset: Optional[int] = None,
+		length: Optional[int] = None,
+	) -> Result: ...
+	def get_node_detail(
+		self,
+		node_path: str,
+		parameters: Optional[str] = None,
+		pages: Optional[str] = None,
+		non_default_only: bool = False,
+	) -> Result: ...
 	def get_node_errors(self, node_path: str) -> Result: ...
 	def update_node(self, node_path: str, properties: dict[str, Any]) -> Result: ...
 	def exec_node_method(
@@ -39,6 +119,38 @@ class IApiService(Protocol):
 class TouchDesignerApiService(IApiService):
 	"""Implementation of the TouchDesigner API service"""
 
+	def __init__(self):
+		# (build tag, etag, entries) for the td module, see _get_class_catalog
+		self._class_catalog: Optional[tuple[str, str, list[dict[str, str]]]] = None
+		# (class name, build tag) -> inspected members, least recently used first
+		self._class_details_cache: OrderedDict[tuple[str, str], dict[str, Any]] = (
+			OrderedDict()
+		)
+		# (module name, section, build tag) -> normalized help text
+		self._module_help_cache: OrderedDict[tuple[str, str, str], str] = OrderedDict()
+		# script hash -> (body code, trailing expression code)
+		self._script_code_cache: OrderedDict[
+			bytes, tuple[Optional[CodeType], Optional[CodeType]]
+		] = OrderedDict()
+		self._script_sessions = ScriptSessionStore()
+		self._procedures = ProcedureRegistry()
+		self._top_capture = TopCapture()
+		# OPType -> built-in parameter defaults, for nonDefaultOnly projections
+		self._par_defaults = ParameterDefaults()
+		# OPType -> (build tag, etag, parameter metadata entries)
+		self._par_catalogs: dict[str, tuple[str, str, list[dict[str, Any]]]] = {}
+		# (node path, projection) -> last synced parameter values
+		self._par_snapshots = ParameterSnapshotCache()
+		# parent path -> (parent, new nodes) awaiting layout, see deferred_layout
+		self._deferred_layout: Optional[dict[str, tuple[Any, list[Any]]]] = None
+		# WebSocket TOP previews share the capture cache and scaler pool
+		self.preview_streams = PreviewStreamHub(self._top_capture)
+		# Segments for encoding=shm payloads, reused across requests
+		self._shared_memory = SharedMemoryPool(SHARED_MEMORY_DIR)
+		# Base namespace for exec_python_script, see refresh_script_namespace
+		self._script_builtins: Optional[dict[str, Any]] = None
+		self._script_main_size = -1
+
 	def get_td_info(self) -> Result:
 		"""Get information about the TouchDesigner server"""
 
@@ -55,86 +167,122 @@ class TouchDesignerApiService(IApiService):
 
 		return success_result(server_info)
 
-	def get_td_python_classes(self) -> Result:
-		"""Get list of Python classes and modules available in TouchDesigner"""
-		classes = []
+	def get_td_python_classes(self, if_none_match: Optional[str] = None) -> Result:
+		"""
+		Get list of Python classes and modules available in TouchDesigner
 
-		for name, obj in inspect.getmembers(td):
-			if name.startswith("_"):
-				continue
+		The list is built once per TouchDesigner build and served from memory.
 
-			description = inspect.getdoc(obj) or ""
-			class_info = {
-				"name": name,
-				"description": description,
-			}
+		Args:
+		    if_none_match: ETag from a previous response; when it still matches,
+		        the class list is omitted and notModified is set
 
-			classes.append(class_info)
+		Returns:
+		    Result: Class list with its ETag
+		"""
+		etag, classes = self._get_class_catalog()
+		if if_none_match and if_none_match.strip() == etag:
+			return success_result({"etag": etag, "notModified": True})
 
-		return success_result({"classes": classes})
+		return success_result({"classes": classes, "etag": etag})
 
-	def get_td_python_class_details(self, class_name: str) -> Result:
-		"""Get detailed information about a specific Python class or module"""
+	def warm_class_catalog(self) -> None:
+		"""Build the td class catalog ahead of the first request"""
+		self._get_class_catalog()
 
-		obj = None
-		if hasattr(td, class_name):
-			obj = getattr(td, class_name)
-			log_message(f"Found {class_name} in td module", LogLevel.DEBUG)
-		else:
-			log_message(f"Class not found: {class_name}", LogLevel.WARNING)
-			raise error_result(f"Class or module not found: {class_name}")
+	def get_td_python_class_details(
+		self, class_name: str, summary: bool = False, member: Optional[str] = None
+	) -> Result:
+		"""
+		Get detailed information about a specific Python class or module
 
-		methods = []
-		properties = []
+		Member listings are cached per class and TouchDesigner build;
+		docstrings are read on first request for each member.
 
-		for name, member in inspect.getmembers(obj):
-			if name.startswith("_"):
-				continue
+		Args:
+		    class_name: Name of the class or module in the td module
+		    summary: Return member names and types only, without docstrings
+		    member: Return only this member, with its docstring
 
-			try:
-				info = {
-					"name": name,
-					"description": inspect.getdoc(member) or "",
-					"type": type(member).__name__,
-				}
-				if (
-					inspect.isfunction(member)
-					or inspect.ismethod(member)
-					or inspect.ismethoddescriptor(member)
-				):
-					methods.append(info)
-				else:
-					properties.append(info)
-			except Exception as e:
-				log_message(
-					f"Error processing member {name}: {str(e)}", LogLevel.WARNING
-				)
+		Returns:
+		    Result: Class details
+		"""
+		entry = self._get_class_details_entry(class_name)
+		if entry is None:
+			log_message(f"Class not found: {class_name}", LogLevel.WARNING)
+			return error_result(f"Class or module not found: {class_name}")
 
-		if inspect.isclass(obj):
-			type_info = inspect.classify_class_attrs(obj)[0].kind
-		else:
-			type_info = type(obj).__name__
+		include_docs = not is_truthy(summary)
+		members = entry["members"]
+		if member:
+			members = [info for info in members if info[0] == member]
+			if not members:
+				return error_result(f"Member not found: {class_name}.{member}")
+			include_docs = True
+
+		methods = []
+		properties = []
+		for name, type_name, is_method in members:
+			info = {"name": name, "type": type_name}
+			if include_docs:
+				info["description"] = self._get_member_doc(entry, name)
+			if is_method:
+				methods.append(info)
+			else:
+				properties.append(info)
 
 		class_details = {
 			"name": class_name,
-			"type": type_info,
-			"description": inspect.getdoc(obj) or "",
+			"type": entry["type"],
+			"description": entry["description"],
 			"methods": methods,
 			"properties": properties,
 		}
 
 		return success_result(class_details)
 
-	def get_module_help(self, module_name: str) -> Result:
-		"""Get Python help() output for a module or class"""
+	def get_module_help(
+		self,
+		module_name: str,
+		section: Optional[str] = None,
+		offset: Optional[int] = None,
+		length: Optional[int] = None,
+	) -> Result:
+		"""
+		Get Python help() output for a module or class
 
+		Rendered text is cached per module name, section and TouchDesigner
+		build, for targets that are modules or have a qualified name.
+
+		Args:
+		    module_name: Module or class name (e.g. "noiseCHOP", "td.noiseCHOP")
+		    section: Render only this member of the target (e.g. "cook")
+		    offset: Character offset of the first character to return
+		    length: Maximum number of characters to return
+
+		Returns:
+		    Result: Help text (or the requested slice of it)
+		"""
 		target = self._resolve_help_target(module_name)
 		if target is None:
 			log_message(f"Module not found: {module_name}", LogLevel.WARNING)
 			return error_result(f"Module not found: {module_name}")
 
+		if section:
+			if not section.isidentifier() or not hasattr(target, section):
+				return error_result(f"Section not found: {module_name}.{section}")
+			target = getattr(target, section)
+
+		try:
+			start = optional_int(offset, 0)
+			size = optional_int(length)
+		except (TypeError, ValueError):
+			return error_result("offset and length must be integers")
+		if start < 0 or (size is not None and size < 1):
+			return error_result("offset must be >= 0 and length must be >= 1")
+
 		try:
-			help_text = self._normalize_help_text(pydoc.render_doc(target))
+			help_text = self._get_help_text(target, module_name, section or "")
 		except Exception as exc:  # noqa: BLE001
 			log_message(
 				f"Error generating help for {module_name}: {str(exc)}",
@@ -144,11 +292,17 @@ class TouchDesignerApiService(IApiService):
 				f"Failed to get help for {module_name}: {str(exc)}",
 			)
 
+		total_length = len(help_text)
+		end = total_length if size is None else min(start + size, total_length)
 		log_message(f"Retrieved help for {module_name}", LogLevel.DEBUG)
 		return success_result(
 			{
 				"moduleName": module_name,
-				"helpText": help_text,
+				"helpText": help_text[start:end],
+				"section": section or None,
+				"offset": start,
+				"totalLength": total_length,
+				"nextOffset": end if end < total_length else None,
 			}
 		)
 
@@ -156,17 +310,125 @@ class TouchDesignerApiService(IApiService):
 		"""Alias for get_node_detail for backwards compatibility"""
 		return self.get_node_detail(node_path)
 
-	def get_node_detail(self, node_path: str) -> Result:
-		"""Get node at the specified path"""
+	def get_node_detail(
+		self,
+		node_path: str,
+		parameters: Optional[str] = None,
+		pages: Optional[str] = None,
+		non_default_only: bool = False,
+	) -> Result:
+		"""Get node at the specified path
+
+		Args:
+		    node_path: Path to the node
+		    parameters: Parameter name globs to include, e.g. "t? r? scale*"
+		    pages: Parameter page names to include, e.g. "Transform,Common"
+		    non_default_only: Only include parameters that differ from their default
+
+		Returns:
+		    Result: Success with the node and its selected parameters, or error
+		"""
 
 		node = td.op(node_path)
 
 		if node is None or not node.valid:
 			raise error_result(f"Node not found at path: {node_path}")
 
-		node_info = self._get_node_summary(node)
+		projection = self._get_parameter_projection(parameters, pages, non_default_only)
+		node_info = self._get_node_summary(node, projection)
 		return success_result(node_info)
 
+	def get_parameter_catalog(
+		self,
+		op_type: Optional[str] = None,
+		node_path: Optional[str] = None,
+		if_none_match: Optional[str] = None,
+	) -> Result:
+		"""
+		Get parameter metadata (label, style, page, default, range, menu) of an OPType
+
+		The catalog of a type is built on first use and then served from memory,
+		so node detail responses only need to carry parameter values.
+
+		Args:
+		    op_type: OPType to describe, e.g. "noiseTOP"
+		    node_path: Node whose OPType to describe (used when op_type is omitted)
+		    if_none_match: ETag from a previous response; when it still matches,
+		        the entries are omitted and notModified is set
+
+		Returns:
+		    Result: Parameter metadata entries with their ETag
+		"""
+		node = None
+		if node_path:
+			node = td.op(node_path)
+			if node is None or not node.valid:
+				return error_result(f"Node not found at path: {node_path}")
+			op_type = node.OPType
+		if not op_type:
+			return error_result("opType or nodePath is required")
+
+		catalog = self._get_parameter_catalog(op_type, node)
+		if catalog is None:
+			return error_result(
+				f"No node of type {op_type} found to describe; pass nodePath instead"
+			)
+		etag, parameters = catalog
+		if if_none_match and if_none_match.strip() == etag:
+			return success_result(
+				{"opType": op_type, "etag": etag, "notModified": True}
+			)
+		return success_result(
+			{"opType": op_type, "parameters": parameters, "etag": etag}
+		)
+
+	def get_parameter_delta(
+		self,
+		node_path: str,
+		since: Optional[str] = None,
+		parameters: Optional[str] = None,
+		pages: Optional[str] = None,
+		non_default_only: bool = False,
+	) -> Result:
+		"""
+		Get the parameters of a node that changed since a version token
+
+		Args:
+		    node_path: Path to the node
+		    since: Version token from a previous response; omit for a full snapshot
+		    parameters: Parameter name globs to include, e.g. "t? r? scale*"
+		    pages: Parameter page names to include, e.g. "Transform,Common"
+		    non_default_only: Only include parameters that differ from their default
+
+		Returns:
+		    Result: New version token, changed values and removed names. When the
+		        token is missing, unknown or evicted, full is set and every value
+		        is returned
+		"""
+		node = td.op(node_path)
+		if node is None or not node.valid:
+			return error_result(f"Node not found at path: {node_path}")
+
+		projection = self._get_parameter_projection(parameters, pages, non_default_only)
+		values = self._get_node_properties(node, projection)
+		snapshot = self._par_snapshots.sync((node.path, projection), values)
+
+		delta = snapshot.since(since) if since else None
+		if delta is None:
+			changed, removed, full = snapshot.values, [], True
+		else:
+			changed, removed = delta
+			full = False
+		return success_result(
+			{
+				"nodePath": node.path,
+				"version": snapshot.token,
+				"full": full,
+				"changed": changed,
+				"removed": removed,
+			}
+		)
+
 	def get_node_errors(self, node_path: str) -> Result:
 		"""Collect error messages for the specified node and its children"""
 
@@ -246,22 +508,43 @@ class TouchDesignerApiService(IApiService):
 		parent_path: str,
 		pattern: Optional[str] = None,
 		include_properties: bool = False,
+		limit: Optional[int] = None,
+		cursor: Optional[str] = None,
+		parameters: Optional[str] = None,
+		pages: Optional[str] = None,
+		non_default_only: bool = False,
 	) -> Result:
 		"""Get nodes under the specified parent path, optionally filtered by pattern
 
+		Nodes are returned in stable path order, one page at a time. Only nodes on
+		the requested page are summarized, so large networks are not evaluated in
+		full.
+
 		Args:
 		    parent_path: Path to the parent node
 		    pattern: Pattern to filter nodes by name (e.g. "text*" for all nodes starting with "text")
 		    include_properties: Whether to include full node properties (default False for better performance)
+		    limit: Maximum number of nodes per page (capped at GET_NODES_MAX_LIMIT)
+		    cursor: Opaque continuation token returned as nextCursor by a previous call
+		    parameters: With include_properties, parameter name globs to include
+		    pages: With include_properties, parameter page names to include
+		    non_default_only: With include_properties, only parameters that differ
+		        from their default
 
 		Returns:
-		    Result: Success with list of nodes or error
+		    Result: Success with a page of nodes and the next cursor, or error
 		"""
 
 		parent_node = td.op(parent_path)
 		if parent_node is None or not parent_node.valid:
 			raise error_result(f"Parent node not found at path: {parent_path}")
 
+		try:
+			page_size = optional_int(limit, GET_NODES_MAX_LIMIT)
+		except (TypeError, ValueError):
+			return error_result(f"Invalid limit: {limit}")
+		page_size = max(1, min(page_size, GET_NODES_MAX_LIMIT))
+
 		if pattern:
 			log_message(
 				f"Calling parent_node.findChildren(name='{pattern}')",
@@ -272,12 +555,41 @@ class TouchDesignerApiService(IApiService):
 			log_message("Calling parent_node.findChildren(depth=1)", LogLevel.DEBUG)
 			nodes = parent_node.findChildren(depth=1)
 
-		if include_properties:
-			node_summaries = [self._get_node_summary(node) for node in nodes]
+		ordered = sorted(
+			((node.path, node) for node in nodes if not _is_scaler(node)),
+			key=itemgetter(0),
+		)
+		paths = [path for path, _ in ordered]
+
+		start = 0
+		if cursor:
+			after_path = self._decode_nodes_cursor(cursor, parent_node.path, pattern)
+			if after_path is None:
+				return error_result("Invalid cursor for this parentPath/pattern")
+			start = bisect.bisect_right(paths, after_path)
+
+		page = [node for _, node in ordered[start : start + page_size]]
+		next_cursor = None
+		if start + page_size < len(ordered):
+			next_cursor = self._encode_nodes_cursor(
+				parent_node.path, pattern, paths[start + page_size - 1]
+			)
+
+		if is_truthy(include_properties):
+			projection = self._get_parameter_projection(
+				parameters, pages, non_default_only
+			)
+			node_summaries = [self._get_node_summary(node, projection) for node in page]
 		else:
-			node_summaries = [self._get_node_summary_light(node) for node in nodes]
+			node_summaries = [self._get_node_summary_light(node) for node in page]
 
-		return success_result({"nodes": node_summaries})
+		return success_result(
+			{
+				"nodes": node_summaries,
+				"nextCursor": next_cursor,
+				"totalCount": len(ordered),
+			}
+		)
 
 	def create_node(
 		self,
@@ -301,54 +613,588 @@ class TouchDesignerApiService(IApiService):
 				f"Failed to create node of type {node_type} under {parent_path}"
 			)
 
-		if parameters and isinstance(parameters, dict):
-			for prop_name, prop_value in parameters.items():
-				try:
-					if hasattr(new_node.par, prop_name):
-						par = getattr(new_node.par, prop_name)
-						if hasattr(par, "val"):
-							par.val = prop_value
-					elif hasattr(new_node, prop_name):
-						prop = getattr(new_node, prop_name)
-						if isinstance(prop, (int, float, str)):
-							setattr(new_node, prop_name, prop_value)
-				except Exception as e:
-					log_message(
-						f"Error setting parameter {prop_name} on new node: {str(e)}",
-						LogLevel.WARNING,
-					)
+		if parameters and isinstance(parameters, dict):
+			self._apply_new_node_parameters(new_node, parameters)
+
+		self._align_new_node(parent_node, new_node, parameters)
+
+		node_info = self._get_node_summary(new_node)
+		return success_result({"result": node_info})
+
+	def build_graph(
+		self,
+		parent_path: str,
+		nodes: list[dict[str, Any]],
+		edges: Optional[list[dict[str, Any]]] = None,
+		rollback: bool = False,
+		full_summary: bool = False,
+	) -> Result:
+		"""
+		Create nodes, set their parameters and wire them together in one call
+
+		Args:
+		    parent_path: Path to the parent COMP
+		    nodes: Entries of the form {"type": str, "name"?: str,
+		        "params"?: dict, "position"?: {"x": number, "y": number}}
+		    edges: Entries of the form {"from": ref, "to": ref,
+		        "fromOutput"?: int, "toInput"?: int}, where ref is the name of a
+		        node entry or the path of an existing node
+		    rollback: Undo the whole build if anything fails: destroy every
+		        created node and restore the previous connections of existing
+		        nodes' inputs that edges were wired into
+		    full_summary: Return full node summaries instead of path and id
+
+		Returns:
+		    Result: Created nodes, connected edge count and any errors
+		"""
+		parent_node = td.op(parent_path)
+		if parent_node is None or not parent_node.valid:
+			return error_result(f"Parent node not found at path: {parent_path}")
+		if not isinstance(nodes, list) or not all(
+			isinstance(entry, dict) and isinstance(entry.get("type"), str)
+			for entry in nodes
+		):
+			return error_result("nodes must be a list of {type, name?, params?}")
+		edges = edges or []
+		if not isinstance(edges, list) or not all(
+			isinstance(edge, dict) for edge in edges
+		):
+			return error_result("edges must be a list of {from, to}")
+
+		errors: list[dict[str, Any]] = []
+		created: list[Any] = []
+		by_name: dict[str, Any] = {}
+		to_align: list[Any] = []
+
+		for index, entry in enumerate(nodes):
+			name = entry.get("name")
+			try:
+				node = parent_node.create(entry["type"], name)
+			except Exception as e:
+				node = None
+				message = str(e)
+			else:
+				message = f"Failed to create node of type {entry['type']}"
+			if node is None or not node.valid:
+				errors.append({"node": index, "error": message})
+				continue
+
+			created.append(node)
+			by_name[name or node.name] = node
+			params = entry.get("params") or {}
+			for failure in self._apply_new_node_parameters(node, params):
+				errors.append({"node": index, **failure})
+
+			position = entry.get("position")
+			if isinstance(position, dict) and "x" in position and "y" in position:
+				node.nodeX = position["x"]
+				node.nodeY = position["y"]
+			elif "nodeX" not in params and "nodeY" not in params:
+				to_align.append(node)
+
+		connected = 0
+		created_paths = {node.path for node in created}
+		# (target path, input index) -> (input connector, its previous sources)
+		replaced_inputs: dict[tuple[str, int], tuple[Any, list[Any]]] = {}
+		for index, edge in enumerate(edges):
+			try:
+				source = self._resolve_graph_ref(parent_node, by_name, edge.get("from"))
+				target = self._resolve_graph_ref(parent_node, by_name, edge.get("to"))
+				output = source.outputConnectors[int(edge.get("fromOutput", 0))]
+				input_index = int(edge.get("toInput", 0))
+				target_input = target.inputConnectors[input_index]
+				if target.path not in created_paths:
+					replaced_inputs.setdefault(
+						(target.path, input_index),
+						(target_input, list(target_input.connections)),
+					)
+				output.connect(target_input)
+				connected += 1
+			except Exception as e:
+				errors.append(
+					{
+						"edge": index,
+						"error": f"Failed to connect {edge.get('from')} -> "
+						f"{edge.get('to')}: {str(e)}",
+					}
+				)
+
+		if errors and is_truthy(rollback):
+			for target_input, sources in replaced_inputs.values():
+				target_input.disconnect()
+				for source_output in sources:
+					source_output.connect(target_input)
+			for node in reversed(created):
+				if node.valid:
+					node.destroy()
+			details = [
+				f"{error['parameter']}: {error['error']}"
+				if "parameter" in error
+				else error["error"]
+				for error in errors
+			]
+			return error_result(
+				f"Graph build failed and was rolled back: {'; '.join(details)}"
+			)
+
+		self._align_new_nodes(parent_node, to_align)
+
+		if is_truthy(full_summary):
+			node_results = [self._get_node_summary(node) for node in created]
+		else:
+			node_results = [{"path": node.path, "id": node.id} for node in created]
+		log_message(
+			f"Built graph under {parent_node.path}: {len(created)} nodes, "
+			f"{connected} edges, {len(errors)} errors",
+			LogLevel.DEBUG,
+		)
+		return success_result(
+			{
+				"nodes": node_results,
+				"edges": connected,
+				"errors": errors,
+			}
+		)
+
+	def _resolve_graph_ref(self, parent_node, by_name: dict[str, Any], ref: Any):
+		"""Resolve an edge endpoint: a node entry name or an existing node path"""
+		if not isinstance(ref, str) or not ref:
+			raise ValueError(f"Invalid node reference: {ref!r}")
+		node = by_name.get(ref) or parent_node.op(ref)
+		if node is None or not node.valid:
+			raise ValueError(f"Node not found: {ref}")
+		return node
+
+	def _apply_new_node_parameters(
+		self, node, parameters: dict[str, Any]
+	) -> list[dict[str, str]]:
+		"""Set parameters (or plain attributes such as nodeX) on a new node
+
+		Returns:
+		    list: {"parameter", "error"} for each value that could not be set
+		"""
+		failed = []
+		for prop_name, prop_value in parameters.items():
+			try:
+				if hasattr(node.par, prop_name):
+					par = getattr(node.par, prop_name)
+					if hasattr(par, "val"):
+						par.val = prop_value
+				elif hasattr(node, prop_name):
+					prop = getattr(node, prop_name)
+					if isinstance(prop, (int, float, str)):
+						setattr(node, prop_name, prop_value)
+				else:
+					failed.append(
+						{"parameter": prop_name, "error": "No such parameter"}
+					)
+			except Exception as e:
+				log_message(
+					f"Error setting parameter {prop_name} on new node: {str(e)}",
+					LogLevel.WARNING,
+				)
+				failed.append({"parameter": prop_name, "error": str(e)})
+		return failed
+
+	def _align_new_node(self, parent_node, new_node, parameters=None) -> None:
+		"""Position a freshly created node on a non-overlapping grid cell.
+
+		Reads the current children of ``parent_node`` (excluding ``new_node``) and
+		places ``new_node`` at the first free grid cell. Existing nodes are never
+		moved. Failures here must not fail node creation, so they are logged only.
+
+		If the caller supplied an explicit ``nodeX``/``nodeY`` via ``parameters``,
+		that deliberate position is respected and auto-alignment is skipped.
+		"""
+		if parameters and ("nodeX" in parameters or "nodeY" in parameters):
+			return
+		if self._deferred_layout is not None:
+			pending = self._deferred_layout.setdefault(
+				parent_node.path, (parent_node, [])
+			)
+			pending[1].append(new_node)
+			return
+		try:
+			existing = [
+				(child.nodeX, child.nodeY, child.nodeWidth, child.nodeHeight)
+				for child in parent_node.children
+				if child.path != new_node.path
+			]
+			x, y = first_free_cell(existing, new_node.nodeWidth, new_node.nodeHeight)
+			new_node.nodeX = x
+			new_node.nodeY = y
+		except Exception as e:
+			log_message(
+				f"Failed to align new node {new_node.path}: {str(e)}",
+				LogLevel.WARNING,
+			)
+
+	@contextlib.contextmanager
+	def deferred_layout(self):
+		"""Lay out nodes created inside the block in one pass
+
+		Instead of re-reading every child of the parent for each new node, the
+		nodes are placed per parent with a single incrementally updated
+		occupancy map. Pending nodes are placed when the block exits, or
+		earlier by flush_deferred_layout. Callers must flush before anything
+		else reads or moves the pending nodes; positions are then the same as
+		aligning them one by one.
+		"""
+		if self._deferred_layout is not None:
+			yield
+			return
+
+		self._deferred_layout = {}
+		try:
+			yield
+		finally:
+			self.flush_deferred_layout()
+			self._deferred_layout = None
+
+	def flush_deferred_layout(self) -> None:
+		"""Place the nodes queued by deferred_layout so far"""
+		if not self._deferred_layout:
+			return
+		pending, self._deferred_layout = self._deferred_layout, {}
+		for parent_node, new_nodes in pending.values():
+			self._align_new_nodes(parent_node, new_nodes)
+
+	def _align_new_nodes(self, parent_node, new_nodes) -> None:
+		"""Position several new nodes of one parent on non-overlapping grid cells.
+
+		Nodes are placed in order, each on the first free cell left by the
+		existing children and the nodes placed before it. Existing nodes are never
+		moved. Failures are logged only, as in _align_new_node.
+		"""
+		try:
+			new_nodes = [node for node in new_nodes if node.valid]
+			new_paths = {node.path for node in new_nodes}
+			existing = [
+				(child.nodeX, child.nodeY, child.nodeWidth, child.nodeHeight)
+				for child in parent_node.children
+				if child.path not in new_paths
+			]
+			positions = place_boxes(
+				existing, [(node.nodeWidth, node.nodeHeight) for node in new_nodes]
+			)
+			for node, (x, y) in zip(new_nodes, positions):
+				node.nodeX = x
+				node.nodeY = y
+		except Exception as e:
+			log_message(
+				f"Failed to align new nodes under {parent_node.path}: {str(e)}",
+				LogLevel.WARNING,
+			)
+
+	def get_top_image(
+		self,
+		node_path: str,
+		format: str = "jpg",
+		quality: Optional[int] = None,
+		max_size: Optional[int] = None,
+		encoding: str = "binary",
+	) -> Result:
+		"""
+		Capture the current output of a TOP as an encoded image
+
+		Args:
+		    node_path: Path to the TOP
+		    format: Image format (jpg or png)
+		    quality: JPEG quality 1-100
+		    max_size: Downscale so the longer side is at most this many pixels
+		    encoding: "binary" to respond with raw image bytes, "base64" for JSON,
+		        "shm" to hand the image over in shared memory
+
+		Returns:
+		    Result: A BinaryPayload, or the image (or its shared memory location)
+		        with its size
+		"""
+		image_format = (format or "jpg").lower()
+		if image_format not in IMAGE_FORMATS:
+			return error_result(
+				f"Unsupported image format: {format}. "
+				f"Use one of: {', '.join(IMAGE_FORMATS)}"
+			)
+		error = _check_encoding(encoding, ("binary", "base64", "shm"))
+		if error:
+			return error
+		try:
+			quality = optional_int(quality)
+			max_size = optional_int(max_size)
+		except (TypeError, ValueError):
+			return error_result("quality and maxSize must be integers")
+		if quality is not None and not 1 <= quality <= 100:
+			return error_result("quality must be between 1 and 100")
+		if max_size is not None and max_size < 1:
+			return error_result("maxSize must be >= 1")
+
+		node = td.op(node_path)
+		if node is None or not node.valid:
+			return error_result(f"Node not found at path: {node_path}")
+		if node.family != "TOP":
+			return error_result(
+				f"Node at {node_path} is not a TOP (family={node.family})"
+			)
+
+		try:
+			image = self._top_capture.capture(node, image_format, quality, max_size)
+		except Exception as e:
+			log_message(f"Error capturing {node_path}: {str(e)}", LogLevel.ERROR)
+			return error_result(f"Failed to capture image from {node_path}: {str(e)}")
+
+		if encoding == "shm":
+			return self._share_payload(
+				image.content,
+				"uint8",
+				[len(image.content)],
+				{
+					"nodePath": node.path,
+					"contentType": image.content_type,
+					"width": image.width,
+					"height": image.height,
+				},
+			)
+		if encoding == "base64":
+			return success_result(
+				{
+					"nodePath": node.path,
+					"contentType": image.content_type,
+					"width": image.width,
+					"height": image.height,
+					"data": base64.b64encode(image.content).decode("ascii"),
+				}
+			)
+		return success_result(
+			BinaryPayload(
+				image.content,
+				image.content_type,
+				{
+					"X-Image-Width": str(image.width),
+					"X-Image-Height": str(image.height),
+					"X-Cache": "HIT" if image.cached else "MISS",
+				},
+			)
+		)
+
+	def release_top_scalers(self) -> None:
+		"""Destroy the pooled scalers used by get_top_image"""
+		self._top_capture.release()
+
+	def set_top_scaler_host(self, comp) -> None:
+		"""Keep the pooled scalers used by get_top_image inside comp"""
+		self._top_capture.set_host(comp)
+
+	def get_chop_data(
+		self,
+		node_path: str,
+		channels: Optional[str] = None,
+		start: Optional[int] = None,
+		end: Optional[int] = None,
+		step: Optional[int] = None,
+		encoding: str = "binary",
+	) -> Result:
+		"""
+		Export CHOP samples as packed little-endian float32
+
+		Args:
+		    node_path: Path to the CHOP
+		    channels: Channel name pattern, e.g. "tx ty r*" (all channels if omitted)
+		    start: First sample index (negative counts from the end)
+		    end: Sample index to stop before (negative counts from the end)
+		    step: Keep every step-th sample
+		    encoding: "binary" for the length-prefixed binary layout, "base64" for JSON,
+		        "shm" to hand the samples over in shared memory
+
+		Returns:
+		    Result: A BinaryPayload, or channel names and base64 samples
+		"""
+		error = _check_encoding(encoding, ("binary", "base64", "shm"))
+		if error:
+			return error
+		try:
+			start = optional_int(start)
+			end = optional_int(end)
+			step = optional_int(step, 1)
+		except (TypeError, ValueError):
+			return error_result("start, end and step must be integers")
+		if step < 1:
+			return error_result("step must be >= 1")
+
+		node = td.op(node_path)
+		if node is None or not node.valid:
+			return error_result(f"Node not found at path: {node_path}")
+		if node.family != "CHOP":
+			return error_result(
+				f"Node at {node_path} is not a CHOP (family={node.family})"
+			)
+
+		try:
+			block = read_chop_block(node, channels, start, end, step)
+		except Exception as e:
+			log_message(f"Error reading {node_path}: {str(e)}", LogLevel.ERROR)
+			return error_result(f"Failed to read CHOP data from {node_path}: {str(e)}")
+
+		if encoding == "shm":
+			return self._share_payload(
+				block.samples,
+				SAMPLE_DTYPE,
+				list(block.samples.shape),
+				{"nodePath": node.path, **block.metadata()},
+			)
+		if encoding == "base64":
+			return success_result(
+				{
+					"nodePath": node.path,
+					**block.metadata(),
+					"data": base64.b64encode(block.tobytes()).decode("ascii"),
+				}
+			)
+		channel_count, sample_count = block.samples.shape
+		return success_result(
+			BinaryPayload(
+				pack_chop_block(block, {"nodePath": node.path}),
+				"application/octet-stream",
+				{
+					"X-Chop-Channels": str(channel_count),
+					"X-Chop-Samples": str(sample_count),
+				},
+			)
+		)
+
+	def get_table_data(
+		self,
+		node_path: str,
+		row_start: Optional[int] = None,
+		row_end: Optional[int] = None,
+		col_start: Optional[int] = None,
+		col_end: Optional[int] = None,
+		layout: str = "rows",
+		encoding: str = "json",
+	) -> Result:
+		"""
+		Read a row/column window of a table DAT as plain strings
+
+		Args:
+		    node_path: Path to the table DAT
+		    row_start: First row (negative counts from the end)
+		    row_end: Row to stop before (negative counts from the end)
+		    col_start: First column (negative counts from the end)
+		    col_end: Column to stop before (negative counts from the end)
+		    layout: "rows" for a list per row, "columns" for a list per column
+		    encoding: "json" to return the cells, "shm" to hand them over in
+		        shared memory as a UTF-8 JSON array
+
+		Returns:
+		    Result: Table size, window bounds and cell values
+		"""
+		error = _check_encoding(encoding, ("json", "shm"))
+		if error:
+			return error
+		try:
+			bounds = [
+				optional_int(value)
+				for value in (row_start, row_end, col_start, col_end)
+			]
+		except (TypeError, ValueError):
+			return error_result(
+				"rowStart, rowEnd, colStart and colEnd must be integers"
+			)
+
+		node, error = self._get_table_dat(node_path)
+		if error:
+			return error
+
+		try:
+			data = read_table(node, *bounds, layout=layout or "rows")
+		except ValueError as e:
+			return error_result(str(e))
+		if encoding == "shm":
+			cells = data.pop(data["layout"])
+			content = json.dumps(cells, separators=(",", ":")).encode("utf-8")
+			return self._share_payload(
+				content, "utf-8", [len(content)], {"nodePath": node.path, **data}
+			)
+		return success_result({"nodePath": node.path, **data})
+
+	def update_table_data(
+		self,
+		node_path: str,
+		values: list[list[Any]],
+		row: int = 0,
+		col: int = 0,
+		truncate: bool = False,
+	) -> Result:
+		"""
+		Replace a rectangular region of a table DAT in one call
+
+		Args:
+		    node_path: Path to the table DAT
+		    values: Row-major cell values written starting at (row, col)
+		    row: Row of the region's top-left cell
+		    col: Column of the region's top-left cell
+		    truncate: Shrink the table so the region ends it
 
-		self._align_new_node(parent_node, new_node, parameters)
+		Returns:
+		    Result: Cells written and the resulting table size
+		"""
+		if not isinstance(values, list) or not all(
+			isinstance(cells, list) for cells in values
+		):
+			return error_result("values must be a list of rows (lists of cells)")
 
-		node_info = self._get_node_summary(new_node)
-		return success_result({"result": node_info})
+		node, error = self._get_table_dat(node_path)
+		if error:
+			return error
 
-	def _align_new_node(self, parent_node, new_node, parameters=None) -> None:
-		"""Position a freshly created node on a non-overlapping grid cell.
+		try:
+			data = write_table(node, values, int(row), int(col), is_truthy(truncate))
+		except (TypeError, ValueError) as e:
+			return error_result(str(e))
+		log_message(
+			f"Wrote {data['cellsWritten']} cells to {node.path}", LogLevel.DEBUG
+		)
+		return success_result({"nodePath": node.path, **data})
 
-		Reads the current children of ``parent_node`` (excluding ``new_node``) and
-		places ``new_node`` at the first free grid cell. Existing nodes are never
-		moved. Failures here must not fail node creation, so they are logged only.
+	def _get_table_dat(self, node_path: str) -> tuple[Any, Optional[Result]]:
+		node = td.op(node_path)
+		if node is None or not node.valid:
+			return None, error_result(f"Node not found at path: {node_path}")
+		if node.family != "DAT" or not getattr(node, "isTable", False):
+			return None, error_result(f"Node at {node_path} is not a table DAT")
+		return node, None
+
+	def release_shared_memory(self, lease_id: str) -> Result:
+		"""Release a shared memory lease so its segment can be reused"""
+		if not self._shared_memory.release(lease_id):
+			return error_result(f"Shared memory lease not found: {lease_id}")
+		return success_result({"leaseId": lease_id, "released": True})
+
+	def close_shared_memory(self) -> None:
+		"""Unmap and delete all shared memory segments"""
+		self._shared_memory.close()
+
+	def _share_payload(
+		self, content: Any, dtype: str, shape: list[int], data: dict[str, Any]
+	) -> Result:
+		"""
+		Copy a payload into shared memory and describe where it is
 
-		If the caller supplied an explicit ``nodeX``/``nodeY`` via ``parameters``,
-		that deliberate position is respected and auto-alignment is skipped.
+		Args:
+		    content: bytes-like payload
+		    dtype: Element type of the payload, e.g. "<f4"
+		    shape: Shape of the payload in elements
+		    data: Response fields to return alongside the location
+
+		Returns:
+		    Result: data plus a sharedMemory entry (path, offset, nbytes, dtype,
+		        shape, leaseId, leaseSeconds)
 		"""
-		if parameters and ("nodeX" in parameters or "nodeY" in parameters):
-			return
 		try:
-			existing = [
-				(child.nodeX, child.nodeY, child.nodeWidth, child.nodeHeight)
-				for child in parent_node.children
-				if child.path != new_node.path
-			]
-			x, y = first_free_cell(existing, new_node.nodeWidth, new_node.nodeHeight)
-			new_node.nodeX = x
-			new_node.nodeY = y
-		except Exception as e:
-			log_message(
-				f"Failed to align new node {new_node.path}: {str(e)}",
-				LogLevel.WARNING,
-			)
+			lease = self._shared_memory.write(content)
+		except (OSError, RuntimeError) as e:
+			log_message(f"Shared memory handoff failed: {str(e)}", LogLevel.ERROR)
+			return error_result(f"Shared memory handoff failed: {str(e)}")
+		return success_result({**data, "sharedMemory": lease.describe(dtype, shape)})
 
 	def delete_node(self, node_path: str) -> Result:
 		"""Delete the node at the specified path"""
@@ -400,39 +1246,47 @@ class TouchDesignerApiService(IApiService):
 
 		return success_result({"result": processed_result})
 
-	def exec_python_script(self, script: str) -> Result:
+	def exec_python_script(
+		self, script: str, session_id: Optional[str] = None
+	) -> Result:
 		"""Execute a Python script directly in TouchDesigner
 
 		Args:
 		    script (str): The Python script to execute
+		    session_id (str, optional): Run in this named session, whose
+		        namespace persists across calls. Opened on first use.
 
 		Returns:
 		    Result: Success result with execution output or error result with message
 		"""
+		if session_id is not None and not is_valid_session_id(session_id):
+			return error_result(
+				"sessionId must be 1-128 characters of letters, digits, '_', '.' or '-'"
+			)
 
 		no_result_sentinel = object()
-		local_vars = {
-			"op": td.op,
-			"ops": td.ops,
-			"me": td.op.me if hasattr(td, "op") and hasattr(td.op, "me") else None,
-			"parent": (td.op("..").path if hasattr(td, "op") and td.op("..") else None),
-			"project": td.project if hasattr(td, "project") else None,
-			"td": td,
-			"result": no_result_sentinel,
-		}
-		# Mirror the Textport/DAT execution environment: TouchDesigner keeps
-		# all of its globals (absTime, OP type names such as noiseTOP, ParMode,
-		# tdu, ui, ...) in the __main__ module namespace. Merging them makes
-		# scripts behave the same as Python written inside a DAT or the
-		# Textport, so code can be copy-pasted between both contexts.
-		td_globals = {
-			name: value
-			for name, value in vars(sys.modules["__main__"]).items()
-			if not name.startswith("_")
-		}
-		namespace = dict(globals())
-		namespace.update(td_globals)
-		namespace.update(local_vars)
+		local_vars = {**self._build_script_locals(), "result": no_result_sentinel}
+		# The per-script namespace only holds the names above and whatever the
+		# script assigns; everything else resolves through the cached base
+		# namespace installed as its builtins (see _get_script_builtins).
+		script_builtins = self._get_script_builtins()
+		session = None
+		if session_id is None:
+			namespace = {"__builtins__": script_builtins, **local_vars}
+		else:
+			session = self._script_sessions.open(
+				session_id, lambda: {"__builtins__": script_builtins, **local_vars}
+			)
+			namespace = session.namespace
+			namespace["__builtins__"] = script_builtins
+			namespace["result"] = no_result_sentinel
+
+		try:
+			body_code, result_code = self._compile_script(script)
+		except SyntaxError as syntax_error:
+			raise Exception(
+				f"Script execution failed: {syntax_error}\n{traceback.format_exc()}"
+			) from syntax_error
 
 		stdout_capture = io.StringIO()
 		stderr_capture = io.StringIO()
@@ -441,80 +1295,267 @@ class TouchDesignerApiService(IApiService):
 			contextlib.redirect_stdout(stdout_capture),
 			contextlib.redirect_stderr(stderr_capture),
 		):
-			if "\n" not in script and ";" not in script:
-				try:
-					result = eval(script, namespace, namespace)
-					namespace["result"] = result
-					processed_result = self._process_method_result(result)
-
-					log_message(
-						f"Script evaluated. Raw result: {repr(result)}",
-						LogLevel.DEBUG,
-					)
+			try:
+				if body_code is not None:
+					exec(body_code, namespace, namespace)
+				if result_code is not None:
+					value = eval(result_code, namespace, namespace)
+					# An explicit `result = ...` in the script takes precedence
+					# over the value of its trailing expression
+					if namespace.get("result") is no_result_sentinel:
+						namespace["result"] = value
+			except Exception as exec_error:
+				raise Exception(
+					f"Script execution failed: {exec_error}\n{traceback.format_exc()}"
+				) from exec_error
 
-					stdout_val = stdout_capture.getvalue()
-					stderr_val = stderr_capture.getvalue()
+		result = namespace.get("result")
+		if result is no_result_sentinel:
+			result = None
+		log_message(f"Script executed. Raw result: {repr(result)}", LogLevel.DEBUG)
+		processed_result = self._process_method_result(result)
 
-					return success_result(
-						{
-							"result": processed_result,
-							"stdout": stdout_val,
-							"stderr": stderr_val,
-						}
-					)
-				except SyntaxError:
-					pass
+		response = {
+			"result": processed_result,
+			"stdout": stdout_capture.getvalue(),
+			"stderr": stderr_capture.getvalue(),
+		}
+		if session is not None:
+			kept = self._script_sessions.record_call(session)
+			if not kept:
+				log_message(
+					f"Closed script session '{session_id}': namespace exceeded "
+					f"{self._script_sessions.max_bytes} bytes",
+					LogLevel.WARNING,
+				)
+			response["session"] = self._get_script_session_info(session, kept)
+		return success_result(response)
+
+	def get_script_sessions(self) -> Result:
+		"""List open exec_python_script sessions"""
+		sessions = [
+			self._get_script_session_info(session)
+			for session in self._script_sessions.list_sessions()
+		]
+		return success_result({"sessions": sessions})
+
+	def close_script_session(self, session_id: str) -> Result:
+		"""
+		Close an exec_python_script session and release its namespace
+
+		Args:
+		    session_id: Session to close
+
+		Returns:
+		    Result: Whether a session was closed
+		"""
+		if not self._script_sessions.close(session_id):
+			return error_result(f"Script session not found: {session_id}")
+		log_message(f"Closed script session '{session_id}'", LogLevel.DEBUG)
+		return success_result({"sessionId": session_id, "closed": True})
+
+	def _get_script_session_info(
+		self, session: ScriptSession, is_open: bool = True
+	) -> dict[str, Any]:
+		now = time.monotonic()
+		return {
+			"sessionId": session.session_id,
+			"calls": session.calls,
+			"approxBytes": session.approx_bytes,
+			"idleSeconds": round(now - session.last_used, 3),
+			"open": is_open,
+		}
+
+	def register_procedure(
+		self, code: str, parameters: str = "", name: Optional[str] = None
+	) -> Result:
+		"""
+		Compile a Python function body once and store it as a procedure
 
+		The id is derived from the parameters and code, so registering the
+		same procedure again returns the same id.
+
+		Args:
+		    code: Function body; ``return`` sets the result of an invocation
+		    parameters: Parameter list as written in a def, e.g. "node_path, size=512"
+		    name: Optional human readable name
+
+		Returns:
+		    Result: The procedure id and signature
+		"""
+		if not isinstance(code, str) or not code.strip():
+			return error_result("code must be a non-empty string")
+		if not isinstance(parameters, str):
+			return error_result("parameters must be a string")
+
+		procedure = self._procedures.get(procedure_id_for(parameters, code))
+		is_new = procedure is None
+		if is_new:
 			try:
-				exec(script, namespace, namespace)
-
-				if namespace.get("result") is no_result_sentinel:
-					lines = script.strip().split("\n")
-					if lines:
-						last_expr = lines[-1].strip()
-						if last_expr and not last_expr.startswith(
-							(
-								"import",
-								"from",
-								"#",
-								"if",
-								"def",
-								"class",
-								"for",
-								"while",
-							)
-						):
-							try:
-								namespace["result"] = eval(
-									last_expr, namespace, namespace
-								)
-								log_message(
-									f"Extracted result from last line: {last_expr}",
-									LogLevel.DEBUG,
-								)
-							except Exception:
-								pass
+				procedure = compile_procedure(code, parameters, name)
+			except Exception as e:
+				return error_result(f"Invalid procedure: {str(e)}")
+			self._procedures.register(procedure)
+			log_message(
+				f"Registered procedure {procedure.procedure_id} ({procedure.name})",
+				LogLevel.DEBUG,
+			)
+		return success_result(
+			{
+				"procedureId": procedure.procedure_id,
+				"name": procedure.name,
+				"signature": f"{procedure.name}{procedure.signature}",
+				"created": is_new,
+			}
+		)
+
+	def invoke_procedure(
+		self, procedure_id: str, args: Optional[dict[str, Any]] = None
+	) -> Result:
+		"""
+		Invoke a registered procedure with keyword arguments
 
-				result = namespace.get("result")
-				if result is no_result_sentinel:
-					result = None
-				processed_result = self._process_method_result(result)
+		Args:
+		    procedure_id: Id returned by register_procedure
+		    args: Keyword arguments for the procedure
 
-				stdout_val = stdout_capture.getvalue()
-				stderr_val = stderr_capture.getvalue()
+		Returns:
+		    Result: The procedure's return value and captured output
+		"""
+		procedure = self._procedures.get(procedure_id)
+		if procedure is None:
+			return error_result(f"Procedure not found: {procedure_id}")
+		if args is None:
+			args = {}
+		if not isinstance(args, dict):
+			return error_result("args must be an object")
+		try:
+			procedure.signature.bind(**args)
+		except TypeError as e:
+			return error_result(f"Invalid arguments for {procedure.name}: {str(e)}")
 
-				return success_result(
-					{
-						"result": processed_result,
-						"stdout": stdout_val,
-						"stderr": stderr_val,
-					}
-				)
+		function = procedure.bind(
+			{"__builtins__": self._get_script_builtins(), **self._build_script_locals()}
+		)
+		stdout_capture = io.StringIO()
+		stderr_capture = io.StringIO()
+
+		with (
+			contextlib.redirect_stdout(stdout_capture),
+			contextlib.redirect_stderr(stderr_capture),
+		):
+			try:
+				result = function(**args)
 			except Exception as exec_error:
 				raise Exception(
-					f"Script execution failed: {exec_error}\n{traceback.format_exc()}"
+					f"Procedure {procedure.name} failed: {exec_error}\n"
+					f"{traceback.format_exc()}"
 				) from exec_error
 
+		return success_result(
+			{
+				"procedureId": procedure_id,
+				"result": self._process_method_result(result),
+				"stdout": stdout_capture.getvalue(),
+				"stderr": stderr_capture.getvalue(),
+			}
+		)
+
+	def delete_procedure(self, procedure_id: str) -> Result:
+		"""Remove a registered procedure"""
+		if not self._procedures.unregister(procedure_id):
+			return error_result(f"Procedure not found: {procedure_id}")
+		return success_result({"procedureId": procedure_id, "deleted": True})
+
+	def _build_script_locals(self) -> dict[str, Any]:
+		"""Names every script and procedure starts with, as in a DAT"""
+		return {
+			"op": td.op,
+			"ops": td.ops,
+			"me": td.op.me if hasattr(td, "op") and hasattr(td.op, "me") else None,
+			"parent": (td.op("..").path if hasattr(td, "op") and td.op("..") else None),
+			"project": td.project if hasattr(td, "project") else None,
+			"td": td,
+		}
+
+	def refresh_script_namespace(self) -> None:
+		"""
+		Rebuild the base namespace shared by exec_python_script calls
+
+		Mirrors the Textport/DAT execution environment: TouchDesigner keeps
+		all of its globals (absTime, OP type names such as noiseTOP, ParMode,
+		tdu, ui, ...) in the __main__ module namespace. Merging them makes
+		scripts behave the same as Python written inside a DAT or the
+		Textport, so code can be copy-pasted between both contexts.
+		"""
+		main_vars = vars(sys.modules["__main__"])
+		base = dict(vars(builtins))
+		base.update(globals())
+		base.update(
+			(name, value)
+			for name, value in main_vars.items()
+			if not name.startswith("_")
+		)
+		self._script_builtins = base
+		self._script_main_size = len(main_vars)
+
+	def _get_script_builtins(self) -> dict[str, Any]:
+		"""
+		Return the cached base namespace, refreshing it when __main__ changes size
+
+		Scripts get it as ``__builtins__``, so name lookups fall through to it
+		after the script's own globals. Assignments land in the per-call
+		globals and never modify the shared snapshot.
+		"""
+		if self._script_builtins is None or self._script_main_size != len(
+			vars(sys.modules["__main__"])
+		):
+			self.refresh_script_namespace()
+		return self._script_builtins
+
+	def _compile_script(
+		self, script: str
+	) -> tuple[Optional[CodeType], Optional[CodeType]]:
+		"""
+		Compile a script into (body, trailing expression) code objects
+
+		The script is parsed once. When its last statement is an expression it
+		is compiled separately in eval mode, so its value can be captured as
+		the result without running it twice. Compiled pairs are kept in an LRU
+		keyed by the script's hash.
+
+		Args:
+		    script: Python source to compile
+
+		Returns:
+		    tuple: (code for all but a trailing expression or None,
+		    code for the trailing expression or None)
+
+		Raises:
+		    SyntaxError: If the script does not parse
+		"""
+		key = hashlib.sha256(script.encode("utf-8", "surrogatepass")).digest()
+		compiled = self._script_code_cache.get(key)
+		if compiled is not None:
+			self._script_code_cache.move_to_end(key)
+			return compiled
+
+		tree = ast.parse(script, "<string>", "exec")
+		statements = tree.body
+		result_code = None
+		if statements and isinstance(statements[-1], ast.Expr):
+			trailing = ast.Expression(statements.pop().value)
+			result_code = compile(trailing, "<string>", "eval")
+		body_code = None
+		if statements:
+			body_code = compile(tree, "<string>", "exec")
+
+		compiled = (body_code, result_code)
+		self._script_code_cache[key] = compiled
+		if len(self._script_code_cache) > SCRIPT_CODE_CACHE_SIZE:
+			self._script_code_cache.popitem(last=False)
+		return compiled
+
 	def update_node(self, node_path: str, properties: dict[str, Any]) -> Result:
 		"""Update properties of the node at the specified path"""
 
@@ -585,9 +1626,224 @@ class TouchDesignerApiService(IApiService):
 			else:
 				raise error_result("No matching properties to update")
 
-	def _get_node_properties(self, node):
+	def update_nodes(
+		self,
+		parent_path: Optional[str] = None,
+		pattern: Optional[str] = None,
+		op_type: Optional[str] = None,
+		recursive: bool = False,
+		properties: Optional[dict[str, Any]] = None,
+		updates: Optional[dict[str, dict[str, Any]]] = None,
+		details: bool = False,
+	) -> Result:
+		"""
+		Update parameters on many nodes in one call
+
+		Targets are either every node under parent_path matching pattern and
+		op_type (each set to properties), or the explicit {path: properties}
+		map in updates. How each property name resolves is worked out once per
+		OPType rather than probed on every node.
+
+		Args:
+		    parent_path: Parent to search for target nodes
+		    pattern: Node name pattern, e.g. "movie*" (default all)
+		    op_type: OPType pattern, e.g. "moviefileinTOP" or "*TOP"
+		    recursive: Search all descendants instead of direct children
+		    properties: Properties to set on every matched node
+		    updates: Explicit {node path: properties} map
+		    details: Include per-node results
+
+		Returns:
+		    Result: Aggregated counts, failures grouped by name and reason, and
+		        optionally per-node results
+		"""
+		if updates:
+			if not isinstance(updates, dict) or not all(
+				isinstance(props, dict) for props in updates.values()
+			):
+				return error_result("updates must map node paths to property objects")
+			targets = [(path, td.op(path), props) for path, props in updates.items()]
+		elif parent_path:
+			if not isinstance(properties, dict) or not properties:
+				return error_result("properties are required with parentPath")
+			nodes = self._find_target_nodes(parent_path, pattern, op_type, recursive)
+			if nodes is None:
+				return error_result(f"Parent node not found at path: {parent_path}")
+			targets = [(node.path, node, properties) for node in nodes]
+		else:
+			return error_result(
+				"Either parentPath with properties, or updates is required"
+			)
+
+		writer = BulkParameterWriter()
+		updated_nodes = 0
+		failed_nodes = 0
+		parameters_set = 0
+		failure_counts: dict[tuple[str, str], int] = {}
+		node_results = []
+		for path, node, props in targets:
+			if node is None or not node.valid:
+				updated, failed = [], [{"name": "*", "reason": "Node not found"}]
+			else:
+				updated, failed = writer.apply(node, props)
+			parameters_set += len(updated)
+			updated_nodes += bool(updated)
+			failed_nodes += bool(failed)
+			for failure in failed:
+				key = (failure["name"], failure["reason"])
+				failure_counts[key] = failure_counts.get(key, 0) + 1
+			if is_truthy(details):
+				node_results.append(
+					{"path": path, "updated": updated, "failed": failed}
+				)
+
+		log_message(
+			f"Bulk update: {parameters_set} parameters on {updated_nodes}/"
+			f"{len(targets)} nodes",
+			LogLevel.DEBUG,
+		)
+		result = {
+			"matched": len(targets),
+			"updatedNodes": updated_nodes,
+			"failedNodes": failed_nodes,
+			"parametersSet": parameters_set,
+			"failures": [
+				{"name": name, "reason": reason, "count": count}
+				for (name, reason), count in failure_counts.items()
+			],
+		}
+		if is_truthy(details):
+			result["nodes"] = node_results
+		return success_result(result)
+
+	def gather_parameters(
+		self,
+		parameters: Any,
+		paths: Optional[list[str]] = None,
+		parent_path: Optional[str] = None,
+		pattern: Optional[str] = None,
+		op_type: Optional[str] = None,
+		recursive: bool = False,
+	) -> Result:
+		"""
+		Read a few parameters from many nodes as columns
+
+		Only the named parameters are evaluated. Nodes are either the explicit
+		paths, or every node under parent_path matching pattern and op_type.
+
+		Args:
+		    parameters: Parameter names, e.g. "opacity tx ty"
+		    paths: Explicit node paths
+		    parent_path: Parent to search for nodes
+		    pattern: Node name pattern, e.g. "movie*" (default all)
+		    op_type: OPType pattern, e.g. "moviefileinTOP" or "*TOP"
+		    recursive: Search all descendants instead of direct children
+
+		Returns:
+		    Result: paths, and one value array per parameter aligned with them
+		        (null where a node lacks the parameter or evaluation failed)
+		"""
+		names = split_list(parameters)
+		if not names:
+			return error_result("parameters are required")
+
+		if paths:
+			if isinstance(paths, str):
+				paths = split_list(paths)
+			nodes = [td.op(path) for path in paths]
+			missing = [
+				path
+				for path, node in zip(paths, nodes)
+				if node is None or not node.valid
+			]
+			if missing:
+				return error_result(f"Nodes not found: {', '.join(missing)}")
+		elif parent_path:
+			nodes = self._find_target_nodes(parent_path, pattern, op_type, recursive)
+			if nodes is None:
+				return error_result(f"Parent node not found at path: {parent_path}")
+		else:
+			return error_result("Either paths or parentPath is required")
+
+		columns = gather_columns(nodes, names, td.OP)
+		return success_result(
+			{
+				"paths": [node.path for node in nodes],
+				"columns": columns,
+			}
+		)
+
+	def _find_target_nodes(
+		self,
+		parent_path: str,
+		pattern: Optional[str],
+		op_type: Optional[str],
+		recursive: bool,
+	) -> Optional[list]:
+		"""Nodes under a parent matching a name and OPType pattern, or None"""
+		parent_node = td.op(parent_path)
+		if parent_node is None or not parent_node.valid:
+			return None
+		if is_truthy(recursive):
+			nodes = parent_node.findChildren(name=pattern or "*")
+		else:
+			nodes = parent_node.findChildren(name=pattern or "*", depth=1)
+		nodes = [
+			node
+			for node in nodes
+			if not _is_scaler(node)
+			and (not op_type or fnmatch.fnmatchcase(node.OPType, op_type))
+		]
+		return nodes
+
+	def _encode_nodes_cursor(
+		self, parent_path: str, pattern: Optional[str], after_path: str
+	) -> str:
+		"""Build the opaque get_nodes continuation token"""
+		payload = json.dumps(
+			{"parent": parent_path, "pattern": pattern or "", "after": after_path}
+		)
+		return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+	def _decode_nodes_cursor(
+		self, cursor: str, parent_path: str, pattern: Optional[str]
+	) -> Optional[str]:
+		"""Return the last path of the previous page, or None if the cursor is invalid"""
+		try:
+			payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+		except Exception:
+			return None
+		if (
+			not isinstance(payload, dict)
+			or payload.get("parent") != parent_path
+			or payload.get("pattern") != (pattern or "")
+			or not isinstance(payload.get("after"), str)
+		):
+			return None
+		return payload["after"]
+
+	def _get_parameter_projection(
+		self, parameters: Any, pages: Any, non_default_only: Any
+	) -> Optional[ParameterProjection]:
+		"""Build a projection, or None when every parameter is requested"""
+		if not parameters and not pages and not is_truthy(non_default_only):
+			return None
+		return ParameterProjection.from_options(
+			parameters, pages, is_truthy(non_default_only)
+		)
+
+	def _get_node_properties(
+		self, node, projection: Optional[ParameterProjection] = None
+	):
+		if projection is None:
+			pars = node.pars("*")
+		else:
+			pars = project_pars(
+				node, projection, self._par_defaults, td.ParMode.CONSTANT
+			)
+
 		params_dict = {}
-		for par in node.pars("*"):
+		for par in pars:
 			try:
 				value = par.eval()
 				if isinstance(value, td.OP):
@@ -619,7 +1875,9 @@ class TouchDesignerApiService(IApiService):
 			)
 			return {"name": node.name if hasattr(node, "name") else "unknown"}
 
-	def _get_node_summary(self, node) -> dict:
+	def _get_node_summary(
+		self, node, projection: Optional[ParameterProjection] = None
+	) -> dict:
 		"""Get detailed information about a node"""
 		try:
 			node_info = {
@@ -627,7 +1885,7 @@ class TouchDesignerApiService(IApiService):
 				"name": node.name,
 				"path": node.path,
 				"opType": node.OPType,
-				"properties": self._get_node_properties(node),
+				"properties": self._get_node_properties(node, projection),
 			}
 
 			return node_info
@@ -637,6 +1895,138 @@ class TouchDesignerApiService(IApiService):
 			)
 			return {"name": node.name if hasattr(node, "name") else "unknown"}
 
+	def _td_build_tag(self) -> str:
+		"""Identify the running TouchDesigner build for cache keys and ETags"""
+		return f"{td.app.version}.{td.app.build}"
+
+	def _get_class_catalog(self) -> tuple[str, list[dict[str, str]]]:
+		"""Return (etag, entries) for the td module, building it on first use"""
+		build_tag = self._td_build_tag()
+		catalog = self._class_catalog
+		if catalog is not None and catalog[0] == build_tag:
+			return catalog[1], catalog[2]
+
+		classes = []
+		for name, obj in inspect.getmembers(td):
+			if name.startswith("_"):
+				continue
+
+			classes.append(
+				{
+					"name": name,
+					"type": self._classify_td_member(obj),
+					"description": inspect.getdoc(obj) or "",
+				}
+			)
+
+		etag = f'"td-classes-{build_tag}-{len(classes)}"'
+		self._class_catalog = (build_tag, etag, classes)
+		log_message(
+			f"Built td class catalog with {len(classes)} entries", LogLevel.DEBUG
+		)
+		return etag, classes
+
+	def _get_parameter_catalog(
+		self, op_type: str, node: Any = None
+	) -> Optional[tuple[str, list[dict[str, Any]]]]:
+		"""
+		Return (etag, entries) for an OPType, building it on first use
+
+		Without a node, the first node of that type in the project is described.
+		Returns None if there is none.
+		"""
+		build_tag = self._td_build_tag()
+		catalog = self._par_catalogs.get(op_type)
+		if catalog is not None and catalog[0] == build_tag:
+			return catalog[1], catalog[2]
+
+		if node is None:
+			if not isinstance(getattr(td, op_type, None), type):
+				return None
+			node = self._find_first_of_type(op_type)
+			if node is None:
+				return None
+
+		parameters = build_parameter_catalog(node)
+		etag = f'"td-pars-{build_tag}-{op_type}-{len(parameters)}"'
+		self._par_catalogs[op_type] = (build_tag, etag, parameters)
+		log_message(
+			f"Built parameter catalog for {op_type} with {len(parameters)} entries",
+			LogLevel.DEBUG,
+		)
+		return etag, parameters
+
+	def _find_first_of_type(self, op_type: str) -> Any:
+		"""Breadth-first search of the project, stopping at the first match"""
+		queue = deque(td.op("/").children)
+		while queue:
+			node = queue.popleft()
+			if node.OPType == op_type:
+				return node
+			# Only COMPs have children
+			queue.extend(getattr(node, "children", ()))
+		return None
+
+	def _classify_td_member(self, obj: Any) -> str:
+		"""Map a td module member onto the TdPythonClassInfo type enum"""
+		if inspect.isclass(obj):
+			return "class"
+		if inspect.ismodule(obj):
+			return "module"
+		if inspect.isroutine(obj):
+			return "function"
+		return "object"
+
+	def _get_class_details_entry(self, class_name: str) -> Optional[dict[str, Any]]:
+		"""Return the cached member listing for a td class, inspecting it on a miss"""
+		key = (class_name, self._td_build_tag())
+		entry = self._class_details_cache.get(key)
+		if entry is not None:
+			self._class_details_cache.move_to_end(key)
+			return entry
+
+		if not class_name or not hasattr(td, class_name):
+			return None
+		obj = getattr(td, class_name)
+		log_message(f"Found {class_name} in td module", LogLevel.DEBUG)
+
+		members = []
+		for name, member in inspect.getmembers(obj):
+			if name.startswith("_"):
+				continue
+
+			is_method = (
+				inspect.isfunction(member)
+				or inspect.ismethod(member)
+				or inspect.ismethoddescriptor(member)
+			)
+			members.append((name, type(member).__name__, is_method))
+
+		entry = {
+			"obj": obj,
+			"type": self._classify_td_member(obj),
+			"description": inspect.getdoc(obj) or "",
+			"members": members,
+			"docs": {},
+		}
+		self._class_details_cache[key] = entry
+		if len(self._class_details_cache) > CLASS_DETAILS_CACHE_SIZE:
+			self._class_details_cache.popitem(last=False)
+		return entry
+
+	def _get_member_doc(self, entry: dict[str, Any], name: str) -> str:
+		"""Return a member's docstring, memoized on its class details entry"""
+		docs = entry["docs"]
+		if name not in docs:
+			try:
+				docs[name] = inspect.getdoc(getattr(entry["obj"], name)) or ""
+			except Exception as e:
+				log_message(
+					f"Error processing member {name}: {str(e)}", LogLevel.WARNING
+				)
+				docs[name] = ""
+		return docs[name]
+
 	def _resolve_help_target(self, module_name: str) -> Optional[Any]:
 		"""Locate a module/class for help() lookup."""
 		if not module_name:
@@ -701,25 +2091,47 @@ class TouchDesignerApiService(IApiService):
 			)
 			return None
 
+	def _get_help_text(self, target: Any, module_name: str, section: str) -> str:
+		"""Return normalized pydoc text for a target, rendering it on a cache miss"""
+		if not self._has_stable_name(target):
+			return self._normalize_help_text(pydoc.render_doc(target))
+
+		key = (module_name, section, self._td_build_tag())
+		help_text = self._module_help_cache.get(key)
+		if help_text is not None:
+			self._module_help_cache.move_to_end(key)
+			return help_text
+
+		help_text = self._normalize_help_text(pydoc.render_doc(target))
+		self._module_help_cache[key] = help_text
+		if len(self._module_help_cache) > MODULE_HELP_CACHE_SIZE:
+			self._module_help_cache.popitem(last=False)
+		return help_text
+
+	def _has_stable_name(self, target: Any) -> bool:
+		"""Whether a help target outlives the request (a module, class or function)"""
+		return inspect.ismodule(target) or isinstance(
+			getattr(target, "__qualname__", None), str
+		)
+
 	def _normalize_help_text(self, text: str) -> str:
 		"""Normalize help text by removing terminal control sequences.
 
 		The pydoc module uses backspace characters (\b) for text formatting
 		(e.g., bold text is written as "c\bc" to print 'c' over 'c').
 		This method removes those backspace sequences to produce clean text.
-		If a backspace is encountered at the start (empty buffer), it is safely
-		ignored as there is no character to remove.
+		Each pass drops the innermost character/backspace pairs, so repeated
+		backspaces erase as many preceding characters. A backspace with no
+		character left before it is safely ignored.
 		"""
 		if not text:
 			return text
-		buffer: list[str] = []
-		for char in text:
-			if char == "\b":
-				if buffer:
-					buffer.pop()
-				continue
-			buffer.append(char)
-		return "".join(buffer)
+		while "\b" in text:
+			reduced = _BACKSPACE_PAIR.sub("", text)
+			if len(reduced) == len(text):
+				break
+			text = reduced
+		return text.replace("\b", "")
 
 	def _process_method_result(self, result: Any) -> Any:
 		"""
@@ -0,0 +1,113 @@
+"""Parameter access across many nodes at once.
+
+How a property name resolves on a node (a parameter, a plain attribute such as
+``nodeX``, or nothing) only depends on the node's OPType for built-in
+parameters, so it is worked out once per (OPType, name) instead of probing
+every node. Custom parameters differ between nodes of the same type and are
+resolved per node. Gathering reads only the named parameters of each node and
+returns them as columns.
+"""
+
+from collections.abc import Iterable
+from typing import Any
+
+_PAR = "par"
+_ATTRIBUTE = "attribute"
+_READ_ONLY = "read-only"
+_MISSING = "missing"
+
+
+class BulkParameterWriter:
+	"""Sets properties on many nodes, resolving each name once per OPType"""
+
+	def __init__(self):
+		self._kinds: dict[tuple[str, str], str] = {}
+
+	def apply(
+		self, node: Any, properties: dict[str, Any]
+	) -> tuple[list[str], list[dict[str, str]]]:
+		"""
+		Set properties on one node, with the same rules as update_node
+
+		Args:
+		    node: Node to update
+		    properties: Parameter or attribute names and their new values
+
+		Returns:
+		    tuple: (updated names, [{"name", "reason"}] for failures)
+		"""
+		updated = []
+		failed = []
+		for name, value in properties.items():
+			try:
+				kind = self._kind(node, name)
+				if kind == _PAR:
+					getattr(node.par, name).val = value
+				elif kind == _ATTRIBUTE:
+					setattr(node, name, value)
+				elif kind == _READ_ONLY:
+					failed.append({"name": name, "reason": "Not a settable property"})
+					continue
+				else:
+					failed.append(
+						{"name": name, "reason": "Property not found on node"}
+					)
+					continue
+				updated.append(name)
+			except Exception as e:
+				failed.append({"name": name, "reason": str(e)})
+		return updated, failed
+
+	def _kind(self, node: Any, name: str) -> str:
+		key = (node.OPType, name)
+		kind = self._kinds.get(key)
+		if kind is not None:
+			return kind
+
+		par = getattr(node.par, name, None)
+		if par is not None:
+			# Custom parameters are not shared by the type; resolve per node
+			if getattr(par, "isCustom", False):
+				return _PAR
+			kind = _PAR
+		elif hasattr(node, name):
+			value = getattr(node, name)
+			kind = _ATTRIBUTE if isinstance(value, (int, float, str)) else _READ_ONLY
+		else:
+			# Another node of this type may have a custom parameter of that name
+			return _MISSING
+		self._kinds[key] = kind
+		return kind
+
+
+def gather_columns(
+	nodes: Iterable[Any], names: Iterable[str], op_class: type
+) -> dict[str, list[Any]]:
+	"""
+	Evaluate the named parameters of each node into one list per name
+
+	Args:
+	    nodes: Nodes to read, in output order
+	    names: Exact parameter names
+	    op_class: Operator class; evaluated operators are returned as paths
+
+	Returns:
+	    dict: {name: values aligned with nodes}; None where a node has no such
+	        parameter or evaluation failed
+	"""
+	columns: dict[str, list[Any]] = {name: [] for name in names}
+	for node in nodes:
+		pars = node.par
+		for name, column in columns.items():
+			par = getattr(pars, name, None)
+			if par is None:
+				column.append(None)
+				continue
+			try:
+				value = par.eval()
+			except Exception:
+				value = None
+			if isinstance(value, op_class):
+				value = value.path
+			column.append(value)
+	return columns
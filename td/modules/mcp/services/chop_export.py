@@ -0,0 +1,116 @@
+"""Bulk export of CHOP channel data as packed float32 samples.
+
+Samples are returned as one little-endian float32 buffer, channel-major
+(all samples of the first channel, then the second, ...), instead of one JSON
+number per sample.
+
+Binary layout produced by ``pack_chop_block``::
+
+    uint32 LE   N, the byte length of the metadata that follows
+    N bytes     UTF-8 JSON metadata, space padded so the samples are 4-byte aligned
+    rest        float32 LE samples, shape (len(channels), numSamples)
+"""
+
+from dataclasses import dataclass
+import json
+import struct
+from typing import Any, Optional
+
+import numpy as np
+
+SAMPLE_DTYPE = "<f4"
+
+_LENGTH_PREFIX = struct.Struct("<I")
+
+
+@dataclass(frozen=True)
+class ChopBlock:
+	"""A (channels x samples) block of CHOP data"""
+
+	channels: list[str]
+	samples: np.ndarray
+	start: int
+	step: int
+	sample_rate: float
+
+	def metadata(self) -> dict[str, Any]:
+		"""Describe the block, without the samples"""
+		return {
+			"channels": self.channels,
+			"numSamples": int(self.samples.shape[1]),
+			"start": self.start,
+			"step": self.step,
+			"sampleRate": self.sample_rate,
+			"dtype": SAMPLE_DTYPE,
+			"shape": [int(n) for n in self.samples.shape],
+		}
+
+	def tobytes(self) -> bytes:
+		return self.samples.tobytes()
+
+
+def read_chop_block(
+	chop: Any,
+	channels: Optional[str] = None,
+	start: Optional[int] = None,
+	end: Optional[int] = None,
+	step: int = 1,
+) -> ChopBlock:
+	"""
+	Read a block of samples from a CHOP
+
+	Args:
+	    chop: Source CHOP
+	    channels: Channel name pattern as accepted by CHOP.chans, e.g. "tx ty r*".
+	        All channels when omitted
+	    start: First sample index (negative counts from the end)
+	    end: Sample index to stop before (negative counts from the end)
+	    step: Keep every step-th sample
+
+	Returns:
+	    ChopBlock: Selected samples as a C-contiguous float32 array
+
+	Raises:
+	    ValueError: If step is not positive
+	"""
+	if step < 1:
+		raise ValueError("step must be >= 1")
+
+	window = slice(start, end, step)
+	if channels:
+		selected = chop.chans(channels)
+		names = [channel.name for channel in selected]
+		# Copy only the selected channels instead of the whole CHOP
+		rows = [channel.numpyArray()[window] for channel in selected]
+		num_samples = len(range(*window.indices(chop.numSamples)))
+		samples = (
+			np.stack(rows) if rows else np.empty((0, num_samples), dtype=np.float32)
+		)
+	else:
+		names = [channel.name for channel in chop.chans()]
+		samples = chop.numpyArray()[:, window]
+
+	return ChopBlock(
+		channels=names,
+		samples=np.ascontiguousarray(samples, dtype=SAMPLE_DTYPE),
+		start=window.indices(chop.numSamples)[0],
+		step=step,
+		sample_rate=float(chop.rate),
+	)
+
+
+def pack_chop_block(block: ChopBlock, extra: Optional[dict] = None) -> bytes:
+	"""
+	Serialize a block into the length-prefixed binary layout
+
+	Args:
+	    block: Block to serialize
+	    extra: Additional metadata fields
+
+	Returns:
+	    bytes: Metadata prefix followed by the samples
+	"""
+	metadata = json.dumps({**(extra or {}), **block.metadata()}).encode("utf-8")
+	padding = -(_LENGTH_PREFIX.size + len(metadata)) % 4
+	metadata += b" " * padding
+	return _LENGTH_PREFIX.pack(len(metadata)) + metadata + block.tobytes()
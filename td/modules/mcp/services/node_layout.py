@@ -5,6 +5,8 @@ unit-verified outside TouchDesigner. All coordinates use TouchDesigner's node
 space: ``(x, y)`` is the lower-left corner and ``y`` grows upward.
 """
 
+import math
+
 # Default grid layout tuning. Kept internal so create_node's API contract is unchanged.
 DEFAULT_COLS = 5
 DEFAULT_GAP = 20.0
@@ -52,9 +54,153 @@ def first_free_cell(
 	its box keeps at least ``gap`` clearance from all boxes in ``existing``.
 	Deterministic. Raises ``RuntimeError`` if no free cell is found within the
 	safety bound.
+
+	Builds an ``OccupancyGrid`` over ``existing`` (O(len(existing))) instead of
+	testing every candidate cell against every box; results are identical to
+	``first_free_cell_scan``.
 	"""
+	if cols < 1 or width + gap <= 0 or height + gap <= 0:
+		return first_free_cell_scan(existing, width, height, cols, gap, origin)
+	return OccupancyGrid(width, height, cols, gap, origin, existing).first_free()
+
+
+def first_free_cell_scan(
+	existing,
+	width,
+	height,
+	cols=DEFAULT_COLS,
+	gap=DEFAULT_GAP,
+	origin=(0.0, 0.0),
+):
+	"""Reference implementation of ``first_free_cell``: O(cells x boxes) scan."""
 	for k in range(_MAX_CELLS):
 		box = _cell_box(k, width, height, cols, gap, origin)
 		if all(not boxes_overlap(box, e, gap) for e in existing):
 			return (box[0], box[1])
 	raise RuntimeError("first_free_cell: no free grid cell within safety bound")
+
+
+class OccupancyGrid:
+	"""Grid cells of one size that are blocked by existing boxes.
+
+	Each box blocks a rectangle of cells in (column, row) space, so adding a box
+	costs O(cells it blocks) and ``first_free`` is amortized O(1): rows are only
+	ever filled, so the scan resumes from the first row that still has a free
+	cell. The rectangle is derived arithmetically and its edges re-checked with
+	the same comparisons as ``boxes_overlap``, so results match the scan exactly.
+	"""
+
+	def __init__(
+		self,
+		width,
+		height,
+		cols=DEFAULT_COLS,
+		gap=DEFAULT_GAP,
+		origin=(0.0, 0.0),
+		existing=(),
+	):
+		self.width = width
+		self.height = height
+		self.cols = cols
+		self.gap = gap
+		self.origin = origin
+		self._last_row = (_MAX_CELLS - 1) // cols
+		self._blocked = {}  # row -> set of blocked columns
+		self._row = 0  # every row above this one is full
+		for box in existing:
+			self.add(box)
+
+	def add(self, box):
+		"""Mark the cells that ``box`` blocks (cells within ``gap`` of it)."""
+		bx, by, bw, bh = box
+		width, height, gap = self.width, self.height, self.gap
+		ox, oy = self.origin
+		step_x = width + gap
+		step_y = height + gap
+
+		# Same comparisons as boxes_overlap(cell, box, gap), split per axis
+		lo = math.floor((bx - width - gap - ox) / step_x)
+		hi = math.ceil((bx + bw + gap - ox) / step_x)
+		cols = []
+		for col in range(max(lo - 1, 0), min(hi + 1, self.cols - 1) + 1):
+			ax = ox + col * step_x
+			if ax < bx + bw + gap and bx < ax + width + gap:
+				cols.append(col)
+		if not cols:
+			return
+
+		lo = math.floor((oy - by - bh - gap) / step_y)
+		hi = math.ceil((oy + height + gap - by) / step_y)
+		for row in range(max(lo - 1, 0), min(hi + 1, self._last_row) + 1):
+			ay = oy - row * step_y
+			if ay < by + bh + gap and by < ay + height + gap:
+				blocked = self._blocked.get(row)
+				if blocked is None:
+					self._blocked[row] = set(cols)
+				else:
+					blocked.update(cols)
+
+	def first_free(self):
+		"""Return ``(x, y)`` of the first free cell, row-major.
+
+		Raises ``RuntimeError`` if no free cell is found within the safety bound.
+		"""
+		while self._row <= self._last_row:
+			row = self._row
+			blocked = self._blocked.get(row, ())
+			if len(blocked) < self.cols:
+				for col in range(self.cols):
+					if row * self.cols + col >= _MAX_CELLS:
+						break
+					if col not in blocked:
+						return self.cell(row, col)
+			self._row += 1
+		raise RuntimeError("first_free_cell: no free grid cell within safety bound")
+
+	def cell(self, row, col):
+		"""Lower-left corner of the cell at ``(row, col)``."""
+		box = _cell_box(
+			row * self.cols + col,
+			self.width,
+			self.height,
+			self.cols,
+			self.gap,
+			self.origin,
+		)
+		return (box[0], box[1])
+
+
+def place_boxes(
+	existing,
+	sizes,
+	cols=DEFAULT_COLS,
+	gap=DEFAULT_GAP,
+	origin=(0.0, 0.0),
+):
+	"""Return ``(x, y)`` for each ``(width, height)`` in ``sizes``, placed in order.
+
+	Each box goes to the first grid cell (for its size) that clears ``existing``
+	and every box placed before it, exactly as calling ``first_free_cell`` once
+	per box with the earlier placements appended to ``existing``. One
+	``OccupancyGrid`` per distinct size is built on first use and updated
+	incrementally, so placing N boxes costs O(len(existing) + N) per size
+	rather than N full rebuilds. Existing boxes are never moved.
+	"""
+	existing = list(existing)
+	grids = {}
+	positions = []
+	for width, height in sizes:
+		if cols < 1 or width + gap <= 0 or height + gap <= 0:
+			x, y = first_free_cell_scan(existing, width, height, cols, gap, origin)
+		else:
+			grid = grids.get((width, height))
+			if grid is None:
+				grid = OccupancyGrid(width, height, cols, gap, origin, existing)
+				grids[(width, height)] = grid
+			x, y = grid.first_free()
+		box = (x, y, width, height)
+		existing.append(box)
+		for grid in grids.values():
+			grid.add(box)
+		positions.append((x, y))
+	return positions
@@ -0,0 +1,40 @@
+"""Parameter metadata catalog, one entry list per OPType.
+
+Labels, styles, pages, defaults, ranges and menu entries of built-in
+parameters are the same for every node of a type, so they are described once
+per OPType and served separately from node values. Custom parameters vary
+per node and are not part of the catalog.
+"""
+
+from typing import Any
+
+
+def describe_par(par: Any) -> dict[str, Any]:
+	"""Describe a parameter's metadata (not its current value)"""
+	entry = {
+		"name": par.name,
+		"label": par.label,
+		"style": par.style,
+		"page": par.page.name if par.page is not None else None,
+		"default": par.default,
+	}
+	if par.isNumber:
+		entry.update(
+			{
+				"min": par.min,
+				"max": par.max,
+				"clampMin": par.clampMin,
+				"clampMax": par.clampMax,
+				"normMin": par.normMin,
+				"normMax": par.normMax,
+			}
+		)
+	if par.isMenu:
+		entry["menuNames"] = list(par.menuNames)
+		entry["menuLabels"] = list(par.menuLabels)
+	return entry
+
+
+def build_parameter_catalog(node: Any) -> list[dict[str, Any]]:
+	"""Describe the built-in parameters of a node's OPType"""
+	return [describe_par(par) for par in node.pars("*") if not par.isCustom]
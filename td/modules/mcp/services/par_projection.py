@@ -0,0 +1,114 @@
+"""Parameter projection for node detail responses.
+
+A projection narrows which parameters of a node are evaluated and returned:
+name globs (passed straight to ``OP.pars``), parameter page names, and a
+non-default-only mode. Non-default checks compare constant parameters with
+per-OPType defaults, so parameters left at their default are skipped without
+being evaluated.
+"""
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+import re
+from typing import Any, Optional
+
+_LIST_SEPARATOR = re.compile(r"[\s,]+")
+
+
+def split_list(value: Any) -> tuple[str, ...]:
+	"""Split a comma or whitespace separated list (or pass a list through)"""
+	if value is None:
+		return ()
+	if isinstance(value, str):
+		return tuple(item for item in _LIST_SEPARATOR.split(value) if item)
+	return tuple(str(item) for item in value if item)
+
+
+@dataclass(frozen=True)
+class ParameterProjection:
+	"""Which parameters of a node to evaluate"""
+
+	patterns: tuple[str, ...] = ("*",)
+	pages: Optional[frozenset[str]] = None
+	non_default_only: bool = False
+
+	@classmethod
+	def from_options(
+		cls,
+		parameters: Any = None,
+		pages: Any = None,
+		non_default_only: bool = False,
+	) -> "ParameterProjection":
+		"""
+		Build a projection from request options
+
+		Args:
+		    parameters: Parameter name globs, e.g. "t? r? scale*"
+		    pages: Parameter page names, e.g. "Transform,Common" (case-insensitive)
+		    non_default_only: Only parameters that differ from their default
+		"""
+		page_names = split_list(pages)
+		return cls(
+			patterns=split_list(parameters) or ("*",),
+			pages=frozenset(page.lower() for page in page_names) or None,
+			non_default_only=bool(non_default_only),
+		)
+
+
+class ParameterDefaults:
+	"""
+	Default values of built-in parameters, cached per OPType
+
+	The defaults of a type are read from the first node of that type seen.
+	Custom parameters differ between nodes of the same type, so they are read
+	from the parameter itself.
+	"""
+
+	def __init__(self):
+		self._by_type: dict[str, dict[str, Any]] = {}
+
+	def for_node(self, node: Any) -> dict[str, Any]:
+		defaults = self._by_type.get(node.OPType)
+		if defaults is None:
+			defaults = {
+				par.name: par.default for par in node.pars("*") if not par.isCustom
+			}
+			self._by_type[node.OPType] = defaults
+		return defaults
+
+	def is_default(self, node: Any, par: Any, constant_mode: Any) -> bool:
+		"""
+		Whether a parameter holds its default value
+
+		Parameters driven by an expression, export or bind never count as
+		default; constant ones compare their stored value without evaluating.
+		"""
+		if par.mode != constant_mode:
+			return False
+		if par.isCustom:
+			default = par.default
+		else:
+			defaults = self.for_node(node)
+			if par.name not in defaults:
+				defaults[par.name] = par.default
+			default = defaults[par.name]
+		return par.val == default
+
+
+def project_pars(
+	node: Any,
+	projection: ParameterProjection,
+	defaults: ParameterDefaults,
+	constant_mode: Any,
+) -> Iterator[Any]:
+	"""Yield the parameters of a node selected by a projection"""
+	for par in node.pars(*projection.patterns):
+		if projection.pages is not None and (
+			par.page is None or par.page.name.lower() not in projection.pages
+		):
+			continue
+		if projection.non_default_only and defaults.is_default(
+			node, par, constant_mode
+		):
+			continue
+		yield par
@@ -0,0 +1,92 @@
+"""Incremental parameter sync with version tokens.
+
+Each synced node keeps one snapshot: its last evaluated parameter values and,
+per parameter, the version at which it last changed. A version token names a
+snapshot lineage (epoch) and a version, so any number of clients polling the
+same node can be answered from that single snapshot with just the parameters
+changed since their token. Snapshots are evicted least recently used first;
+tokens of an evicted snapshot get a full response.
+"""
+
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass, field
+import secrets
+from typing import Any, Optional
+
+MAX_SNAPSHOTS = 256
+
+
+@dataclass
+class ParameterSnapshot:
+	"""Last seen parameter values of a node and when each one changed"""
+
+	epoch: str
+	version: int = 0
+	values: dict[str, Any] = field(default_factory=dict)
+	changed_at: dict[str, int] = field(default_factory=dict)
+	removed_at: dict[str, int] = field(default_factory=dict)
+
+	@property
+	def token(self) -> str:
+		return f"{self.epoch}.{self.version}"
+
+	def update(self, values: dict[str, Any]) -> None:
+		"""Record new values, bumping the version only if anything changed"""
+		version = self.version + 1
+		changed = False
+		for name, value in values.items():
+			if name not in self.values or self.values[name] != value:
+				self.changed_at[name] = version
+				self.removed_at.pop(name, None)
+				changed = True
+		for name in self.values.keys() - values.keys():
+			del self.changed_at[name]
+			self.removed_at[name] = version
+			changed = True
+		if changed:
+			self.values = values
+			self.version = version
+
+	def since(self, token: Optional[str]) -> Optional[tuple[dict[str, Any], list[str]]]:
+		"""
+		Parameters changed and removed after a token
+
+		Returns:
+		    Optional[tuple]: (changed values, removed names), or None when the
+		        token does not belong to this snapshot and a full sync is needed
+		"""
+		epoch, _, version = (token or "").partition(".")
+		if epoch != self.epoch or not version.isdigit():
+			return None
+		since = int(version)
+		if since > self.version:
+			return None
+		changed = {
+			name: self.values[name]
+			for name, at in self.changed_at.items()
+			if at > since
+		}
+		removed = [name for name, at in self.removed_at.items() if at > since]
+		return changed, removed
+
+
+class ParameterSnapshotCache:
+	"""Bounded snapshots by key, least recently used evicted first"""
+
+	def __init__(self, max_snapshots: int = MAX_SNAPSHOTS):
+		self.max_snapshots = max_snapshots
+		self._snapshots: OrderedDict[Hashable, ParameterSnapshot] = OrderedDict()
+
+	def sync(self, key: Hashable, values: dict[str, Any]) -> ParameterSnapshot:
+		"""Return the key's snapshot updated with values, creating it if needed"""
+		snapshot = self._snapshots.get(key)
+		if snapshot is None:
+			snapshot = ParameterSnapshot(epoch=secrets.token_hex(4))
+			self._snapshots[key] = snapshot
+			while len(self._snapshots) > self.max_snapshots:
+				self._snapshots.popitem(last=False)
+		else:
+			self._snapshots.move_to_end(key)
+		snapshot.update(values)
+		return snapshot
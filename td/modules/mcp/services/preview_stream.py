@@ -0,0 +1,235 @@
+"""
+Live TOP previews over the WebServer DAT's WebSocket connections
+
+The WebServer DAT answers each HTTP request with a single response, so an
+MJPEG ``multipart/x-mixed-replace`` body cannot be streamed from
+``onHTTPRequest``. Previews are pushed over WebSockets instead, one binary
+JPEG message per frame:
+
+- Connect to ``ws://<host>:<port>/api/stream/top?nodePath=/project1/out1``
+  (optional ``fps``, ``maxSize``, ``quality``, ``ack``), or connect to any
+  path and send ``{"action": "subscribe", "nodePath": ..., ...}``.
+- A frame is encoded only when the TOP has cooked since the last frame, and
+  at most ``fps`` times per second.
+- After each frame, send ``{"action": "ack"}``. Until then newer frames for
+  that client are dropped rather than queued. Pass ``ack=false`` to disable
+  flow control.
+- Send ``{"action": "unsubscribe"}`` to stop. Status and errors arrive as
+  JSON text messages with a ``type`` field.
+"""
+
+from dataclasses import dataclass
+import json
+import time
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+from mcp.services.top_capture import TopCapture
+import td
+from utils.logging import log_message
+from utils.params import is_truthy, optional_int
+from utils.types import LogLevel
+
+STREAM_PATH = "/api/stream/top"
+
+DEFAULT_FPS = 10.0
+MAX_FPS = 60.0
+DEFAULT_MAX_SIZE = 640
+DEFAULT_QUALITY = 70
+
+_TICK_SCRIPT = (
+	"from mcp.services.api_service import api_service\n"
+	"api_service.preview_streams.tick()"
+)
+
+
+@dataclass
+class PreviewSubscription:
+	"""Stream settings and delivery state for one WebSocket client"""
+
+	web_server: Any
+	node_path: str
+	fps: float
+	max_size: int
+	quality: int
+	ack: bool
+	next_due: float = 0.0
+	last_cook: Optional[int] = None
+	awaiting_ack: bool = False
+	frames_sent: int = 0
+
+
+def _parse_options(options: dict[str, Any]) -> PreviewSubscription:
+	"""
+	Build subscription settings from subscribe options or URI query values
+
+	Raises:
+	    ValueError: If an option is missing or out of range
+	"""
+	node_path = options.get("nodePath")
+	if not isinstance(node_path, str) or not node_path:
+		raise ValueError("nodePath is required")
+
+	fps = float(options.get("fps", DEFAULT_FPS))
+	if not 0 < fps <= MAX_FPS:
+		raise ValueError(f"fps must be greater than 0 and at most {MAX_FPS:g}")
+	max_size = optional_int(options.get("maxSize"), DEFAULT_MAX_SIZE)
+	if max_size < 1:
+		raise ValueError("maxSize must be >= 1")
+	quality = int(options.get("quality", DEFAULT_QUALITY))
+	if not 1 <= quality <= 100:
+		raise ValueError("quality must be between 1 and 100")
+	ack = is_truthy(options.get("ack", True))
+
+	return PreviewSubscription(
+		web_server=None,
+		node_path=node_path,
+		fps=fps,
+		max_size=max_size,
+		quality=quality,
+		ack=ack,
+	)
+
+
+class PreviewStreamHub:
+	"""
+	Pushes TOP previews to subscribed WebSocket clients
+
+	Frames are produced from a tick that re-schedules itself every frame
+	while at least one client is subscribed.
+	"""
+
+	def __init__(
+		self,
+		capture: TopCapture,
+		clock: Callable[[], float] = time.monotonic,
+		schedule: Optional[Callable[[], None]] = None,
+	):
+		self._capture = capture
+		self._clock = clock
+		self._schedule_tick = schedule or self._schedule_with_run
+		self._subscriptions: dict[str, PreviewSubscription] = {}
+		self._tick_scheduled = False
+
+	def on_open(self, web_server: Any, client: str, uri: str) -> None:
+		"""Subscribe right away when the client connected to STREAM_PATH"""
+		parts = urlsplit(uri or "")
+		if parts.path.rstrip("/") != STREAM_PATH:
+			return
+		self._subscribe(web_server, client, dict(parse_qsl(parts.query)))
+
+	def on_text(self, web_server: Any, client: str, data: str) -> bool:
+		"""
+		Handle a control message from a client
+
+		Returns:
+		    bool: False if the message was not a preview stream message
+		"""
+		try:
+			message = json.loads(data)
+		except (TypeError, ValueError):
+			return False
+		if not isinstance(message, dict):
+			return False
+
+		action = message.get("action")
+		if action == "subscribe":
+			self._subscribe(web_server, client, message)
+		elif action == "ack":
+			subscription = self._subscriptions.get(client)
+			if subscription is not None:
+				subscription.awaiting_ack = False
+		elif action == "unsubscribe":
+			self._subscriptions.pop(client, None)
+			self._send_text(web_server, client, {"type": "unsubscribed"})
+		else:
+			return False
+		return True
+
+	def on_close(self, client: str) -> None:
+		self._subscriptions.pop(client, None)
+
+	def tick(self) -> None:
+		"""Send a frame to every subscriber that is due, ready and has news"""
+		self._tick_scheduled = False
+		now = self._clock()
+		for client, subscription in list(self._subscriptions.items()):
+			if subscription.awaiting_ack or now < subscription.next_due:
+				continue
+			try:
+				self._send_frame(client, subscription, now)
+			except Exception as e:
+				log_message(
+					f"Preview stream for {subscription.node_path} stopped: {e}",
+					LogLevel.WARNING,
+				)
+				self._subscriptions.pop(client, None)
+				self._send_text(
+					subscription.web_server, client, {"type": "error", "error": str(e)}
+				)
+		self._ensure_ticking()
+
+	def _send_frame(
+		self, client: str, subscription: PreviewSubscription, now: float
+	) -> None:
+		node = td.op(subscription.node_path)
+		if node is None or not node.valid:
+			raise ValueError(f"Node not found at path: {subscription.node_path}")
+		if node.family != "TOP":
+			raise ValueError(f"Node at {subscription.node_path} is not a TOP")
+
+		# Cooks only if the TOP is dirty, so unviewed TOPs still update
+		node.cook()
+		cook_count = node.totalCooks
+		if cook_count == subscription.last_cook:
+			return
+
+		image = self._capture.capture(
+			node, "jpg", subscription.quality, subscription.max_size
+		)
+		subscription.web_server.webSocketSendBinary(client, image.content)
+		subscription.last_cook = cook_count
+		subscription.next_due = now + 1.0 / subscription.fps
+		subscription.awaiting_ack = subscription.ack
+		subscription.frames_sent += 1
+
+	def _subscribe(self, web_server: Any, client: str, options: dict[str, Any]) -> None:
+		try:
+			subscription = _parse_options(options)
+		except (TypeError, ValueError) as e:
+			self._send_text(web_server, client, {"type": "error", "error": str(e)})
+			return
+
+		subscription.web_server = web_server
+		self._subscriptions[client] = subscription
+		log_message(
+			f"Preview stream for {subscription.node_path} opened by {client}",
+			LogLevel.DEBUG,
+		)
+		self._send_text(
+			web_server,
+			client,
+			{
+				"type": "subscribed",
+				"nodePath": subscription.node_path,
+				"fps": subscription.fps,
+				"maxSize": subscription.max_size,
+				"quality": subscription.quality,
+				"ack": subscription.ack,
+			},
+		)
+		self._ensure_ticking()
+
+	def _ensure_ticking(self) -> None:
+		if self._subscriptions and not self._tick_scheduled:
+			self._tick_scheduled = True
+			self._schedule_tick()
+
+	def _schedule_with_run(self) -> None:
+		td.run(_TICK_SCRIPT, delayFrames=1)
+
+	def _send_text(self, web_server: Any, client: str, message: dict) -> None:
+		try:
+			web_server.webSocketSendText(client, json.dumps(message))
+		except Exception as e:
+			log_message(f"Failed to send to {client}: {e}", LogLevel.DEBUG)
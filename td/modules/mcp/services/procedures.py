@@ -0,0 +1,122 @@
+"""Stored procedures for exec_python_script style calls.
+
+A procedure is a Python function body registered once under a stable id and
+later invoked with keyword arguments, so clients send a small JSON args object
+instead of the whole script. The body is parsed, validated and compiled at
+registration; callers supply the globals a procedure runs with.
+"""
+
+import ast
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import inspect
+import textwrap
+from types import CodeType, FunctionType
+from typing import Any, Optional
+
+MAX_PROCEDURES = 256
+
+_FUNCTION_NAME = "procedure"
+
+
+@dataclass(frozen=True)
+class Procedure:
+	"""A compiled procedure body and its call signature"""
+
+	procedure_id: str
+	name: str
+	parameters: str
+	code: CodeType
+	defaults: Optional[tuple]
+	kwdefaults: Optional[dict]
+	signature: inspect.Signature
+
+	def bind(self, script_globals: dict[str, Any]) -> FunctionType:
+		"""Create the procedure's function with the given globals"""
+		function = FunctionType(self.code, script_globals, self.name, self.defaults)
+		function.__kwdefaults__ = self.kwdefaults
+		return function
+
+
+def procedure_id_for(parameters: str, body: str) -> str:
+	"""Derive the stable id of a procedure from its signature and body"""
+	digest = hashlib.sha256(f"{parameters}\0{body}".encode("utf-8", "surrogatepass"))
+	return f"proc_{digest.hexdigest()[:16]}"
+
+
+def compile_procedure(
+	body: str, parameters: str = "", name: Optional[str] = None
+) -> Procedure:
+	"""
+	Compile a function body into a Procedure
+
+	Args:
+	    body: Function body; ``return`` sets the procedure's result
+	    parameters: Parameter list as written in a def, e.g. "node_path, size=512"
+	    name: Optional human readable name (does not affect the id)
+
+	Returns:
+	    Procedure: The compiled procedure
+
+	Raises:
+	    SyntaxError: If the parameters or body do not form a valid function
+	    ValueError: If parameters contain anything but a parameter list
+	"""
+	_check_parameter_list(parameters)
+
+	source = f"def {_FUNCTION_NAME}({parameters}):\n" + textwrap.indent(
+		textwrap.dedent(body).strip("\n") or "pass", "    "
+	)
+	module_code = compile(source, f"<procedure {name or _FUNCTION_NAME}>", "exec")
+	namespace: dict[str, Any] = {}
+	# Only defines the function; defaults are evaluated here, once
+	exec(module_code, namespace)
+	function = namespace[_FUNCTION_NAME]
+
+	return Procedure(
+		procedure_id=procedure_id_for(parameters, body),
+		name=name or _FUNCTION_NAME,
+		parameters=parameters,
+		code=function.__code__,
+		defaults=function.__defaults__,
+		kwdefaults=function.__kwdefaults__,
+		signature=inspect.signature(function),
+	)
+
+
+def _check_parameter_list(parameters: str) -> None:
+	"""Reject parameters that close the def and add statements of their own"""
+	module = ast.parse(f"def {_FUNCTION_NAME}({parameters}): pass")
+	if not (
+		len(module.body) == 1
+		and isinstance(module.body[0], ast.FunctionDef)
+		and len(module.body[0].body) == 1
+		and isinstance(module.body[0].body[0], ast.Pass)
+		and not module.body[0].decorator_list
+		and module.body[0].returns is None
+	):
+		raise ValueError("parameters must be a parameter list")
+
+
+class ProcedureRegistry:
+	"""Registered procedures by id, least recently used evicted first"""
+
+	def __init__(self, max_procedures: int = MAX_PROCEDURES):
+		self.max_procedures = max_procedures
+		self._procedures: OrderedDict[str, Procedure] = OrderedDict()
+
+	def register(self, procedure: Procedure) -> None:
+		self._procedures[procedure.procedure_id] = procedure
+		self._procedures.move_to_end(procedure.procedure_id)
+		while len(self._procedures) > self.max_procedures:
+			self._procedures.popitem(last=False)
+
+	def get(self, procedure_id: str) -> Optional[Procedure]:
+		procedure = self._procedures.get(procedure_id)
+		if procedure is not None:
+			self._procedures.move_to_end(procedure_id)
+		return procedure
+
+	def unregister(self, procedure_id: str) -> bool:
+		return self._procedures.pop(procedure_id, None) is not None
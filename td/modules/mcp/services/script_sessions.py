@@ -0,0 +1,180 @@
+"""Named, persistent namespaces for exec_python_script.
+
+A session keeps the globals of the scripts run in it (helpers, imports,
+intermediate results) so clients do not resend the same prelude on every call.
+Sessions are evicted after an idle timeout, when too many are open, or when
+their namespace grows past a memory cap.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import re
+import sys
+import time
+from types import FunctionType, ModuleType
+from typing import Any, Callable, Optional
+
+DEFAULT_IDLE_TIMEOUT = 600.0
+DEFAULT_MAX_SESSIONS = 16
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_SESSION_ID_PATTERN = re.compile(r"^[A-Za-z0-9_.-]{1,128}$")
+
+# Rebound by exec_python_script on every call (the shared base namespace and
+# the call's result slot), so never billed to the session
+_UNCOUNTED_NAMES = frozenset({"__builtins__", "result"})
+
+
+@dataclass
+class ScriptSession:
+	"""A named namespace shared by consecutive exec_python_script calls"""
+
+	session_id: str
+	namespace: dict[str, Any]
+	created_at: float
+	last_used: float
+	calls: int = 0
+	approx_bytes: int = 0
+	# Values the session was opened with; names still bound to the same
+	# object are not counted against the memory cap
+	base_values: dict[str, Any] = field(default_factory=dict)
+
+
+def is_valid_session_id(session_id: Any) -> bool:
+	"""Session ids are 1-128 characters of letters, digits, '_', '.' or '-'"""
+	return isinstance(session_id, str) and bool(_SESSION_ID_PATTERN.match(session_id))
+
+
+def estimate_namespace_size(
+	namespace: dict[str, Any], base_values: Optional[dict[str, Any]] = None
+) -> int:
+	"""
+	Approximate the memory held by a namespace
+
+	Sums sys.getsizeof over each value and, for lists, tuples, sets and dicts,
+	over their direct items. Modules and functions are not counted since they
+	are shared with the rest of the process, and neither are ``__builtins__``
+	and ``result``.
+
+	Args:
+	    namespace: Namespace to measure
+	    base_values: Initial values; other names still bound to the same object
+	        are left out of the estimate
+
+	Returns:
+	    int: Approximate size in bytes
+	"""
+	base_values = base_values or {}
+	total = 0
+	for name, value in namespace.items():
+		if name in _UNCOUNTED_NAMES:
+			continue
+		if name in base_values and base_values[name] is value:
+			continue
+		if isinstance(value, (ModuleType, FunctionType, type)):
+			continue
+		total += sys.getsizeof(value)
+		if isinstance(value, dict):
+			for key, item in value.items():
+				total += sys.getsizeof(key) + sys.getsizeof(item)
+		elif isinstance(value, (list, tuple, set, frozenset)):
+			for item in value:
+				total += sys.getsizeof(item)
+	return total
+
+
+class ScriptSessionStore:
+	"""
+	Bounded collection of script sessions, least recently used first
+
+	Idle sessions are swept whenever the store is accessed, so no timer or
+	background thread is needed on the TouchDesigner main thread.
+	"""
+
+	def __init__(
+		self,
+		idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+		max_sessions: int = DEFAULT_MAX_SESSIONS,
+		max_bytes: int = DEFAULT_MAX_BYTES,
+		clock: Callable[[], float] = time.monotonic,
+	):
+		self.idle_timeout = idle_timeout
+		self.max_sessions = max_sessions
+		self.max_bytes = max_bytes
+		self._clock = clock
+		self._sessions: OrderedDict[str, ScriptSession] = OrderedDict()
+
+	def open(
+		self, session_id: str, build_namespace: Callable[[], dict[str, Any]]
+	) -> ScriptSession:
+		"""
+		Return the named session, creating it with a fresh namespace if needed
+
+		Args:
+		    session_id: Session name chosen by the client
+		    build_namespace: Factory for the initial namespace of a new session
+
+		Returns:
+		    ScriptSession: The open session, marked as most recently used
+		"""
+		now = self._clock()
+		self.evict_idle(now)
+
+		session = self._sessions.get(session_id)
+		if session is None:
+			namespace = build_namespace()
+			session = ScriptSession(
+				session_id=session_id,
+				namespace=namespace,
+				created_at=now,
+				last_used=now,
+				base_values=dict(namespace),
+			)
+			self._sessions[session_id] = session
+			while len(self._sessions) > self.max_sessions:
+				self._sessions.popitem(last=False)
+		else:
+			session.last_used = now
+			self._sessions.move_to_end(session_id)
+		return session
+
+	def record_call(self, session: ScriptSession) -> bool:
+		"""
+		Update a session's usage after a call and enforce the memory cap
+
+		Args:
+		    session: Session the call ran in
+
+		Returns:
+		    bool: False if the session exceeded the cap and was closed
+		"""
+		session.calls += 1
+		session.last_used = self._clock()
+		session.approx_bytes = estimate_namespace_size(
+			session.namespace, session.base_values
+		)
+		if session.approx_bytes > self.max_bytes:
+			self.close(session.session_id)
+			return False
+		return True
+
+	def close(self, session_id: str) -> bool:
+		"""Drop a session and its namespace. Returns False if it was not open"""
+		return self._sessions.pop(session_id, None) is not None
+
+	def evict_idle(self, now: Optional[float] = None) -> list[str]:
+		"""Close sessions idle for longer than idle_timeout and return their ids"""
+		now = self._clock() if now is None else now
+		expired = [
+			session_id
+			for session_id, session in self._sessions.items()
+			if now - session.last_used > self.idle_timeout
+		]
+		for session_id in expired:
+			del self._sessions[session_id]
+		return expired
+
+	def list_sessions(self) -> list[ScriptSession]:
+		"""Return open sessions, least recently used first"""
+		self.evict_idle()
+		return list(self._sessions.values())
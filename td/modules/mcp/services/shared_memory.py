@@ -0,0 +1,188 @@
+"""Shared-memory handoff of large payloads to clients on the same host.
+
+Instead of sending a payload in the HTTP response, it is copied into a
+memory-mapped file and the response only names the file, offset and size.
+Segments are owned by this process and recycled: a segment is handed out
+under a lease, and once the client releases the lease (or it expires) the
+segment is reused for the next payload of the same or smaller size.
+"""
+
+import contextlib
+from dataclasses import dataclass
+import itertools
+import mmap
+import os
+import secrets
+import tempfile
+import time
+from typing import Any, Callable, Optional
+
+DEFAULT_LEASE_SECONDS = 30.0
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+MIN_SEGMENT_BYTES = 1024 * 1024
+
+_SEGMENT_PREFIX = "td-mcp-"
+
+
+def default_directory() -> str:
+	"""/dev/shm where available (RAM backed on Linux), else the temp directory"""
+	if os.path.isdir("/dev/shm"):
+		return os.path.join("/dev/shm", "td-mcp")
+	return os.path.join(tempfile.gettempdir(), "td-mcp")
+
+
+def segment_capacity(nbytes: int) -> int:
+	"""Round a size up to a power of two, at least MIN_SEGMENT_BYTES"""
+	capacity = MIN_SEGMENT_BYTES
+	while capacity < nbytes:
+		capacity *= 2
+	return capacity
+
+
+@dataclass
+class SharedSegment:
+	"""A memory-mapped file and its current lease"""
+
+	path: str
+	capacity: int
+	buffer: mmap.mmap
+	lease_id: Optional[str] = None
+	lease_expires: float = 0.0
+	last_used: float = 0.0
+
+
+@dataclass(frozen=True)
+class SharedLease:
+	"""Where a payload was written and how long it stays there"""
+
+	lease_id: str
+	path: str
+	offset: int
+	nbytes: int
+	lease_seconds: float
+
+	def describe(self, dtype: str, shape: list[int], **extra: Any) -> dict[str, Any]:
+		"""Build the response fields a client needs to map the payload"""
+		return {
+			"path": self.path,
+			"offset": self.offset,
+			"nbytes": self.nbytes,
+			"dtype": dtype,
+			"shape": shape,
+			"leaseId": self.lease_id,
+			"leaseSeconds": self.lease_seconds,
+			**extra,
+		}
+
+
+class SharedMemoryPool:
+	"""
+	Recycled memory-mapped segments leased out one payload at a time
+
+	Expired leases are reclaimed whenever a payload is written, so no timer is
+	needed on the TouchDesigner main thread.
+	"""
+
+	def __init__(
+		self,
+		directory: Optional[str] = None,
+		lease_seconds: float = DEFAULT_LEASE_SECONDS,
+		max_bytes: int = DEFAULT_MAX_BYTES,
+		clock: Callable[[], float] = time.monotonic,
+	):
+		self.directory = directory or default_directory()
+		self.lease_seconds = lease_seconds
+		self.max_bytes = max_bytes
+		self._clock = clock
+		self._segments: list[SharedSegment] = []
+		self._names = itertools.count()
+
+	def write(self, data: Any) -> SharedLease:
+		"""
+		Copy a payload into a free segment and lease it out
+
+		Args:
+		    data: bytes-like payload (bytes, bytearray, memoryview, numpy array)
+
+		Returns:
+		    SharedLease: Location of the payload
+
+		Raises:
+		    RuntimeError: If every segment that would fit is still leased and
+		        creating another would exceed max_bytes
+		"""
+		view = memoryview(data).cast("B")
+		nbytes = view.nbytes
+		now = self._clock()
+		segment = self._acquire(nbytes, now)
+		segment.buffer[:nbytes] = view
+		segment.lease_id = f"lease_{secrets.token_hex(8)}"
+		segment.lease_expires = now + self.lease_seconds
+		segment.last_used = now
+		return SharedLease(
+			lease_id=segment.lease_id,
+			path=segment.path,
+			offset=0,
+			nbytes=nbytes,
+			lease_seconds=self.lease_seconds,
+		)
+
+	def release(self, lease_id: str) -> bool:
+		"""Return a leased segment to the pool. Returns False if not leased"""
+		for segment in self._segments:
+			if segment.lease_id == lease_id:
+				segment.lease_id = None
+				return True
+		return False
+
+	def close(self) -> None:
+		"""Unmap and delete every segment"""
+		for segment in self._segments:
+			self._destroy(segment)
+		self._segments.clear()
+
+	def _is_leased(self, segment: SharedSegment, now: float) -> bool:
+		return segment.lease_id is not None and now < segment.lease_expires
+
+	def _acquire(self, nbytes: int, now: float) -> SharedSegment:
+		free = [s for s in self._segments if not self._is_leased(s, now)]
+		fitting = [s for s in free if s.capacity >= nbytes]
+		if fitting:
+			return min(fitting, key=lambda s: (s.capacity, s.last_used))
+
+		capacity = segment_capacity(nbytes)
+		total = sum(s.capacity for s in self._segments)
+		# Make room by dropping free segments, least recently used first
+		for segment in sorted(free, key=lambda s: s.last_used):
+			if total + capacity <= self.max_bytes:
+				break
+			self._segments.remove(segment)
+			self._destroy(segment)
+			total -= segment.capacity
+		if total + capacity > self.max_bytes:
+			raise RuntimeError(
+				f"Shared memory pool exhausted: {nbytes} bytes requested, "
+				f"{total} of {self.max_bytes} bytes leased"
+			)
+
+		segment = self._create(capacity)
+		self._segments.append(segment)
+		return segment
+
+	def _create(self, capacity: int) -> SharedSegment:
+		os.makedirs(self.directory, exist_ok=True)
+		path = os.path.join(
+			self.directory,
+			f"{_SEGMENT_PREFIX}{os.getpid()}-{next(self._names)}.seg",
+		)
+		with open(path, "w+b") as f:
+			f.truncate(capacity)
+			buffer = mmap.mmap(f.fileno(), capacity)
+		return SharedSegment(path=path, capacity=capacity, buffer=buffer)
+
+	def _destroy(self, segment: SharedSegment) -> None:
+		try:
+			segment.buffer.close()
+		finally:
+			with contextlib.suppress(OSError):
+				os.remove(segment.path)
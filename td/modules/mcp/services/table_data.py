@@ -0,0 +1,117 @@
+"""Sliced reads and region writes for table DATs.
+
+Reads return plain cell strings for a row/column window, either row-major
+(a list per row) or columnar (a list per column). Writes replace a
+rectangular region in one call, growing the table when the region extends
+past it.
+"""
+
+from typing import Any, Optional
+
+TABLE_LAYOUTS = ("rows", "columns")
+
+
+def _window(start: Optional[int], end: Optional[int], size: int) -> range:
+	return range(*slice(start, end).indices(size))
+
+
+def read_table(
+	dat: Any,
+	row_start: Optional[int] = None,
+	row_end: Optional[int] = None,
+	col_start: Optional[int] = None,
+	col_end: Optional[int] = None,
+	layout: str = "rows",
+) -> dict[str, Any]:
+	"""
+	Read a window of a table DAT
+
+	Args:
+	    dat: Source table DAT
+	    row_start: First row (negative counts from the end)
+	    row_end: Row to stop before (negative counts from the end)
+	    col_start: First column (negative counts from the end)
+	    col_end: Column to stop before (negative counts from the end)
+	    layout: "rows" for a list per row, "columns" for a list per column
+
+	Returns:
+	    dict: Table size, window bounds and the cell strings
+
+	Raises:
+	    ValueError: If layout is not one of TABLE_LAYOUTS
+	"""
+	if layout not in TABLE_LAYOUTS:
+		raise ValueError(f"layout must be one of: {', '.join(TABLE_LAYOUTS)}")
+
+	rows = _window(row_start, row_end, dat.numRows)
+	cols = _window(col_start, col_end, dat.numCols)
+	data = {
+		"numRows": dat.numRows,
+		"numCols": dat.numCols,
+		"rowStart": rows.start,
+		"rowCount": len(rows),
+		"colStart": cols.start,
+		"colCount": len(cols),
+		"layout": layout,
+	}
+	# dat.row()/dat.col() return a whole row/column of cells per call, far
+	# cheaper than indexing cell by cell
+	if layout == "rows":
+		data["rows"] = [
+			[cell.val for cell in dat.row(r)[cols.start : cols.stop]] for r in rows
+		]
+	else:
+		data["columns"] = [
+			[cell.val for cell in dat.col(c)[rows.start : rows.stop]] for c in cols
+		]
+	return data
+
+
+def write_table(
+	dat: Any,
+	values: list[list[Any]],
+	row: int = 0,
+	col: int = 0,
+	truncate: bool = False,
+) -> dict[str, Any]:
+	"""
+	Replace a rectangular region of a table DAT
+
+	Args:
+	    dat: Target table DAT
+	    values: Row-major cell values; None becomes an empty cell
+	    row: Row of the region's top-left cell
+	    col: Column of the region's top-left cell
+	    truncate: Shrink the table so the region ends it (row + height rows,
+	        col + width columns). With row=0 and col=0 the table becomes values
+
+	Returns:
+	    dict: Cells written and the resulting table size
+
+	Raises:
+	    ValueError: If row or col is negative
+	"""
+	if row < 0 or col < 0:
+		raise ValueError("row and col must be >= 0")
+
+	height = len(values)
+	width = max((len(cells) for cells in values), default=0)
+	if truncate:
+		num_rows, num_cols = row + height, col + width
+	else:
+		num_rows = max(dat.numRows, row + height)
+		num_cols = max(dat.numCols, col + width)
+	if (num_rows, num_cols) != (dat.numRows, dat.numCols):
+		dat.setSize(num_rows, num_cols)
+
+	written = 0
+	for r, cells in enumerate(values, start=row):
+		cells = ["" if value is None else value for value in cells]
+		if col == 0 and len(cells) == num_cols:
+			dat.replaceRow(r, cells)
+		else:
+			for c, value in enumerate(cells, start=col):
+				dat[r, c] = value
+		written += len(cells)
+
+	return {"cellsWritten": written, "numRows": dat.numRows, "numCols": dat.numCols}
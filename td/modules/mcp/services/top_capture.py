@@ -0,0 +1,195 @@
+"""
+TOP image capture for the TouchDesigner MCP Web Server
+
+Encodes the current output of a TOP to JPEG or PNG bytes. Downscaling goes
+through a Select TOP and resolution TOP pair that is created once per source
+node and reused (instead of being created and destroyed for every capture).
+The pairs live in the MCP component (see set_host), not next to the source
+node, so they never show up in the user's networks. The last encoded image per
+(node, size, format, quality) is reused until the source TOP cooks again.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import td
+from utils.logging import log_message
+from utils.types import LogLevel
+
+# Supported formats: name -> (file extension passed to saveByteArray, MIME type)
+IMAGE_FORMATS = {
+	"jpg": (".jpg", "image/jpeg"),
+	"jpeg": (".jpg", "image/jpeg"),
+	"png": (".png", "image/png"),
+}
+
+MAX_POOLED_SCALERS = 8
+MAX_CACHED_IMAGES = 32
+
+SCALER_PREFIX = "__mcp_scaler__"
+
+
+@dataclass(frozen=True)
+class CapturedImage:
+	"""An encoded TOP image"""
+
+	content: bytes
+	content_type: str
+	width: int
+	height: int
+	cached: bool = False
+
+
+def fit_within(width: int, height: int, max_size: Optional[int]) -> tuple[int, int]:
+	"""Scale (width, height) down so the longer side is at most max_size"""
+	if not max_size or max(width, height) <= max_size:
+		return width, height
+	if width >= height:
+		return max_size, max(1, round(height * max_size / width))
+	return max(1, round(width * max_size / height)), max_size
+
+
+class TopCapture:
+	"""Encodes TOP images, pooling scalers and caching results per cook"""
+
+	def __init__(
+		self,
+		max_scalers: int = MAX_POOLED_SCALERS,
+		max_images: int = MAX_CACHED_IMAGES,
+	):
+		self.max_scalers = max_scalers
+		self.max_images = max_images
+		# COMP that holds the scalers; the source node's parent until set_host
+		self.host: Any = None
+		# source node path -> (select TOP, resolution TOP) downscaling it
+		self._scalers: OrderedDict[str, tuple[Any, Any]] = OrderedDict()
+		# (path, width, height, format, quality) -> (cook count, CapturedImage)
+		self._images: OrderedDict[tuple, tuple[int, CapturedImage]] = OrderedDict()
+
+	def capture(
+		self,
+		node: Any,
+		image_format: str = "jpg",
+		quality: Optional[int] = None,
+		max_size: Optional[int] = None,
+	) -> CapturedImage:
+		"""
+		Encode the current output of a TOP
+
+		Args:
+		    node: Source TOP
+		    image_format: One of IMAGE_FORMATS
+		    quality: JPEG quality 1-100 (ignored for PNG)
+		    max_size: Downscale so the longer side is at most this many pixels
+
+		Returns:
+		    CapturedImage: Encoded image, possibly reused from the cache
+
+		Raises:
+		    RuntimeError: If TouchDesigner returns no image data
+		"""
+		extension, content_type = IMAGE_FORMATS[image_format]
+		if content_type != "image/jpeg":
+			quality = None
+
+		# Cooks only if the TOP is dirty, so an unviewed TOP whose inputs
+		# changed is not served from the cache
+		node.cook()
+		width, height = fit_within(node.width, node.height, max_size)
+
+		key = (node.path, width, height, extension, quality)
+		cook_count = getattr(node, "totalCooks", None)
+		cached = self._images.get(key)
+		if cached is not None and cook_count is not None and cached[0] == cook_count:
+			self._images.move_to_end(key)
+			return CapturedImage(
+				cached[1].content, content_type, width, height, cached=True
+			)
+
+		source = node
+		if (width, height) != (node.width, node.height):
+			source = self._get_scaler(node, width, height)
+
+		if quality is None:
+			byte_array = source.saveByteArray(extension)
+		else:
+			byte_array = source.saveByteArray(extension, quality=quality / 100)
+		if not byte_array:
+			raise RuntimeError(
+				f"Failed to capture image from {node.path}: "
+				"saveByteArray returned no data"
+			)
+
+		image = CapturedImage(bytes(byte_array), content_type, width, height)
+		if cook_count is not None:
+			self._images[key] = (cook_count, image)
+			self._images.move_to_end(key)
+			while len(self._images) > self.max_images:
+				self._images.popitem(last=False)
+		return image
+
+	def set_host(self, comp: Any) -> None:
+		"""Create scalers inside comp from now on, dropping those made elsewhere"""
+		if comp is self.host:
+			return
+		for path in list(self._scalers):
+			self._destroy_scaler(path)
+		self.host = comp
+
+	def release(self) -> None:
+		"""Destroy all pooled scalers and drop cached images"""
+		for path in list(self._scalers):
+			self._destroy_scaler(path)
+		self._images.clear()
+
+	def _get_scaler(self, node: Any, width: int, height: int) -> Any:
+		"""Return the pooled resolution TOP for a node, set to width x height"""
+		pair = self._scalers.get(node.path)
+		if pair is None or not all(scaler_op.valid for scaler_op in pair):
+			if pair is not None:
+				self._destroy_scaler(node.path)
+			pair = self._create_scaler(node)
+			self._scalers[node.path] = pair
+			while len(self._scalers) > self.max_scalers:
+				self._destroy_scaler(next(iter(self._scalers)))
+		else:
+			self._scalers.move_to_end(node.path)
+		select, scaler = pair
+		if select.par.top.eval() != node:
+			select.par.top = node.path
+
+		if scaler.par.resolutionw.eval() != width:
+			scaler.par.resolutionw = width
+		if scaler.par.resolutionh.eval() != height:
+			scaler.par.resolutionh = height
+		return scaler
+
+	def _create_scaler(self, node: Any) -> tuple[Any, Any]:
+		host = self.host
+		if host is None or not host.valid:
+			host = node.parent()
+		name = f"{SCALER_PREFIX}{node.id}"
+		for stale in (host.op(name + "_select"), host.op(name)):
+			if stale is not None:
+				stale.destroy()
+		select = host.create(td.selectTOP, name + "_select")
+		select.par.top = node.path
+		scaler = host.create(td.resolutionTOP, name)
+		scaler.inputConnectors[0].connect(select)
+		scaler.par.outputresolution = "custom"
+		log_message(f"Created scaler for {node.path}", LogLevel.DEBUG)
+		return select, scaler
+
+	def _destroy_scaler(self, path: str) -> None:
+		pair = self._scalers.pop(path, None)
+		if pair is None:
+			return
+		for scaler_op in reversed(pair):
+			try:
+				if scaler_op.valid:
+					scaler_op.destroy()
+			except Exception as e:
+				log_message(
+					f"Failed to destroy scaler for {path}: {e}", LogLevel.WARNING
+				)
@@ -23,12 +23,36 @@ def onServerStart(webServerDAT):
 	print("======================================================")
 	print("=========== HTTP SERVER STARTED ===========")
 	print("======================================================")
+	try:
+		from mcp.services.api_service import api_service
+
+		api_service.warm_class_catalog()
+	except Exception as e:
+		print(f"[WARNING] Failed to warm class catalog: {str(e)}")
+	try:
+		from mcp.services.api_service import api_service
+
+		api_service.set_top_scaler_host(webServerDAT.parent())
+	except Exception as e:
+		print(f"[WARNING] Failed to set TOP scaler host: {str(e)}")
 	return
 
 
 def onServerStop(webServerDAT):
 	"""Called when the web server stops"""
 	print("HTTP server stopped")
+	try:
+		from mcp.services.api_service import api_service
+
+		api_service.release_top_scalers()
+	except Exception as e:
+		print(f"[WARNING] Failed to release TOP scalers: {str(e)}")
+	try:
+		from mcp.services.api_service import api_service
+
+		api_service.close_shared_memory()
+	except Exception as e:
+		print(f"[WARNING] Failed to close shared memory: {str(e)}")
 	return
 
 
@@ -125,6 +149,39 @@ def onHTTPRequest(webServerDAT, request, response):
 	return _controller_manager.handle_request(webServerDAT, request, response)
 
 
+def onWebSocketOpen(webServerDAT, client, uri):
+	"""Start a TOP preview stream when the client connected to its path"""
+	try:
+		from mcp.services.api_service import api_service
+
+		api_service.preview_streams.on_open(webServerDAT, client, uri)
+	except Exception as e:
+		print(f"MCP: Error opening WebSocket: {str(e)}")
+	return
+
+
+def onWebSocketClose(webServerDAT, client):
+	"""Stop any TOP preview stream of the client"""
+	try:
+		from mcp.services.api_service import api_service
+
+		api_service.preview_streams.on_close(client)
+	except Exception as e:
+		print(f"MCP: Error closing WebSocket: {str(e)}")
+	return
+
+
+def onWebSocketReceiveText(webServerDAT, client, data):
+	"""Handle TOP preview stream control messages"""
+	try:
+		from mcp.services.api_service import api_service
+
+		api_service.preview_streams.on_text(webServerDAT, client, data)
+	except Exception as e:
+		print(f"MCP: Error handling WebSocket message: {str(e)}")
+	return
+
+
 log_module = _module_factory.get_module("utils.logging")
 if log_module:
 	types_module = _module_factory.get_module("utils.types")
@@ -5,3 +5,7 @@ Provides API endpoint definitions and HTTP status code settings
 
 # Enable LogLevel.DEBUG logging
 DEBUG = True
+
+# Directory for shared memory payload segments (encoding=shm).
+# None uses /dev/shm/td-mcp where available, else <temp dir>/td-mcp
+SHARED_MEMORY_DIR = None
@@ -0,0 +1,25 @@
+"""
+TouchDesigner MCP Web Server Request Parameter Utilities
+Parses request values that may arrive as query strings
+"""
+
+from typing import Any, Optional
+
+
+def is_truthy(value: Any) -> bool:
+	"""Interpret a flag that may arrive as a query string ("true"/"false")"""
+	if isinstance(value, str):
+		return value.strip().lower() in ("1", "true", "yes")
+	return bool(value)
+
+
+def optional_int(value: Any, default: Optional[int] = None) -> Optional[int]:
+	"""
+	Parse an optional integer that may arrive as a query string
+
+	Returns default for None or "". Raises TypeError or ValueError otherwise
+	if the value is not an integer.
+	"""
+	if value in (None, ""):
+		return default
+	return int(value)
@@ -3,7 +3,9 @@ TouchDesigner MCP Web Server Serialization Utilities
 Provides JSON serialization functionality for objects
 """
 
-from typing import Any
+import base64
+import json
+from typing import Any, Callable
 
 
 def safe_serialize(obj: Any) -> Any:
@@ -24,6 +26,9 @@ def safe_serialize(obj: Any) -> Any:
 	if isinstance(obj, (int, float, bool, str)):
 		return obj
 
+	if obj.__class__.__name__ == "BinaryPayload":
+		return _convert_binary(obj)
+
 	if isinstance(obj, (list, tuple)):
 		return [safe_serialize(item) for item in obj]
 
@@ -55,3 +60,103 @@ def safe_serialize(obj: Any) -> Any:
 			return str(obj)
 
 	return str(obj)
+
+
+def _convert_result(obj: Any) -> Any:
+	if hasattr(obj, "success") and hasattr(obj, "data") and hasattr(obj, "error"):
+		result_dict = {"success": obj.success}
+		if obj.success and obj.data is not None:
+			result_dict["data"] = obj.data
+		elif not obj.success and obj.error is not None:
+			result_dict["error"] = str(obj.error)
+		return result_dict
+	return str(obj)
+
+
+def _convert_binary(obj: Any) -> Any:
+	return {
+		"contentType": obj.content_type,
+		"encoding": "base64",
+		"data": base64.b64encode(obj.content).decode("ascii"),
+	}
+
+
+def _convert_evaluable(obj: Any) -> Any:
+	try:
+		val = obj.eval()
+		if hasattr(val, "path") and callable(getattr(val, "path", None)):
+			return val.path
+		return val
+	except:
+		return str(obj)
+
+
+def _convert_path(obj: Any) -> Any:
+	return obj.path
+
+
+def _convert_page(obj: Any) -> Any:
+	return f"Page:{obj.name}" if hasattr(obj, "name") else str(obj)
+
+
+def _convert_attributes(obj: Any) -> Any:
+	try:
+		return obj.__dict__
+	except:
+		return str(obj)
+
+
+def _select_converter(obj: Any) -> Callable[[Any], Any]:
+	"""Pick the conversion safe_serialize would apply to objects of this type"""
+	if obj.__class__.__name__ == "Result":
+		return _convert_result
+	if obj.__class__.__name__ == "BinaryPayload":
+		return _convert_binary
+	if hasattr(obj, "eval") and callable(obj.eval):
+		return _convert_evaluable
+	if hasattr(obj, "path") and callable(getattr(obj, "path", None)):
+		return _convert_path
+	if obj.__class__.__name__ == "Page":
+		return _convert_page
+	if hasattr(obj, "__dict__"):
+		return _convert_attributes
+	return str
+
+
+class TdJSONEncoder(json.JSONEncoder):
+	"""
+	JSON encoder that converts TouchDesigner objects while it writes output
+
+	Applies the same conversions as safe_serialize (Par values, OP paths, Page
+	names, Result objects, binary payloads, object attributes, str() fallback)
+	from ``default``, so payloads are encoded in a single pass without building
+	a copied tree first. The conversion chosen for each type is cached on first
+	sight.
+	"""
+
+	_converters: dict[type, Callable[[Any], Any]] = {}
+
+	def default(self, o: Any) -> Any:
+		converter = self._converters.get(type(o))
+		if converter is None:
+			converter = _select_converter(o)
+			self._converters[type(o)] = converter
+		return converter(o)
+
+
+def safe_dumps(obj: Any) -> str:
+	"""
+	Encode an object to a JSON string, converting TouchDesigner objects on the fly
+
+	Args:
+	    obj: Object to encode (typically a Result dictionary)
+
+	Returns:
+	    JSON string
+	"""
+	try:
+		return json.dumps(obj, cls=TdJSONEncoder)
+	except TypeError:
+		# Dict keys that JSON cannot encode natively need safe_serialize's str()
+		# key conversion, which requires the copied tree.
+		return json.dumps(safe_serialize(obj))
@@ -1,8 +1,9 @@
 """
 Type definitions module for TouchDesigner MCP Web server
-Defines Result and APIResponse types
+Defines Result, APIResponse and BinaryPayload types
 """
 
+from dataclasses import dataclass, field
 from typing import Any, TypedDict
 
 
@@ -19,11 +20,26 @@ class APIResponse(TypedDict, total=False):
 
 	statusCode: int
 	statusReason: str
-	data: str  # JSON string
+	data: Any  # JSON string, or bytes for a BinaryPayload
 	content_type: str
 	headers: dict[str, str]
 
 
+@dataclass
+class BinaryPayload:
+	"""
+	Raw response body returned as Result data
+
+	The controller sends ``content`` as-is with ``content_type`` instead of
+	encoding the Result as JSON. Inside JSON (e.g. batch results) it is
+	encoded as base64.
+	"""
+
+	content: bytes
+	content_type: str
+	headers: dict[str, str] = field(default_factory=dict)
+
+
 class LogLevel:
 	"""Log level definitions"""
 
@@ -109,6 +109,9 @@ describe("genHandlers", () => {
 			for (const operationId of EXPECTED_OPERATION_IDS) {
 				expect(written).toContain(`def ${operationId}(`);
 				expect(written).toContain(`"${operationId}",`);
+				// Arguments are bound through the per-operation binder cache, not
+				// per-request reflection on the service method.
+				expect(written).toContain(`get_binder("${operationId}")`);
 			}
 		});
 
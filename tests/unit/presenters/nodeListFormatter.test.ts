@@ -117,6 +117,33 @@ describe("nodeListFormatter", () => {
 			expect(result).not.toContain("omitted");
 		});
 
+		it("should surface the next page cursor", () => {
+			const data: NodeListData = {
+				nextCursor: "eyJhZnRlciI6ICIvcHJvamVjdDEvZ2VvMSJ9",
+				nodes: [createNode(1, "geo1", "geometry")],
+				parentPath: "/project1",
+				totalCount: 3,
+			};
+
+			const result = formatNodeList(data, { detailLevel: "summary" });
+
+			expect(result).toContain(
+				'cursor="eyJhZnRlciI6ICIvcHJvamVjdDEvZ2VvMSJ9"',
+			);
+		});
+
+		it("should not show a next page hint on the last page", () => {
+			const data: NodeListData = {
+				nextCursor: null,
+				nodes: [createNode(1, "geo1", "geometry")],
+				parentPath: "/project1",
+			};
+
+			const result = formatNodeList(data, { detailLevel: "summary" });
+
+			expect(result).not.toContain("cursor=");
+		});
+
 		it("should format detailed mode as JSON", () => {
 			const nodes: TdNode[] = [createNode(1, "geo1", "geometry")];
 